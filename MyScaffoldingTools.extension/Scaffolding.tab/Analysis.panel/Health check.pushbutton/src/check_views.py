@@ -3,6 +3,7 @@
 import re
 from pyrevit import revit, DB
 from views import get_project_views_and_viewports
+from schedules import get_schedule_table
 from score_counter import ScoreCounter
 
 counter = ScoreCounter()
@@ -126,9 +127,10 @@ def check_viewports_have_correct_types(views, outputter):
         outputter.print_response("Section callout viewport types", "OK. No viewports are found on the project.")
 
 
-def check_material_list_headers(schedule, headers, num_of_cols, outputter):
+def check_material_list_headers(table, headers, outputter):
     correct_headers = True
     counter.increment_checks()
+    num_of_cols = len(table[0]) if table else 0
 
     if len(headers) != num_of_cols:
         outputter.print_response(
@@ -139,7 +141,7 @@ def check_material_list_headers(schedule, headers, num_of_cols, outputter):
         correct_headers = False
     else:
         for col_index in range(num_of_cols):
-            col_name = schedule.GetCellText(DB.SectionType.Body, 0, col_index)
+            col_name = table[0][col_index]
             if headers[col_index] != col_name:
                 correct_headers = False
                 outputter.print_response(
@@ -152,14 +154,14 @@ def check_material_list_headers(schedule, headers, num_of_cols, outputter):
         outputter.print_response("Material list headers", "OK.")
         counter.increment_points()
 
-def check_material_list_column_cells(schedule, headers, num_of_rows, outputter):
+def check_material_list_column_cells(table, headers, outputter):
     has_non_unique = False
     has_empty = False  
     counter.increment_checks(2)
 
     for col_index in range(1, 6):
-        for row_index in range(1, num_of_rows):
-            cell_value = schedule.GetCellText(DB.SectionType.Body, row_index, col_index)
+        for row in table[1:]:
+            cell_value = row[col_index] if col_index < len(row) else ""
             
             if cell_value == "<varies>":
                 has_non_unique = True
@@ -188,32 +190,23 @@ def check_material_list_column_cells(schedule, headers, num_of_rows, outputter):
         outputter.print_response("Material list does not contain empty values", "OK.")
 
 
-def check_material_list_content(schedule, outputter):
+def check_material_list_content(table, outputter):
     headers = ["Count", "Product number", "Product name (FIN)", "Product name (ENG)", "Product name (SWE)", "Weight", "Length info", "Width info"]
-    
-    table_data = schedule.GetTableData()
-    section_data = table_data.GetSectionData(DB.SectionType.Body)
-    num_of_rows = section_data.NumberOfRows
-    num_of_cols = section_data.NumberOfColumns
-
-    check_material_list_headers(schedule, headers, num_of_cols, outputter)
-    check_material_list_column_cells(schedule, headers, num_of_rows, outputter)
 
+    check_material_list_headers(table, headers, outputter)
+    check_material_list_column_cells(table, headers, outputter)
 
-def check_schedule_names_and_get_material_schedule(schedules, outputter):
-    material_list = None
 
-    for schedule in schedules:
-        if schedule["view"].Name == "Material list":
-            material_list = schedule["view"]
+def check_schedule_names_and_get_material_schedule(outputter):
+    material_list = get_schedule_table("Material list")
     
-    if material_list:
+    if material_list is not None:
         counter.increment_points()
         outputter.print_response("Material list schedule name", "OK.")
 
         check_material_list_content(material_list, outputter)
     else:
-        outputter.print_response("Material list schedule name:" "Incorrect. No schedule named as <b><i>Material list</i></b> found.", "red")
+        outputter.print_response("Material list schedule name", "Incorrect. No schedule named as <b><i>Material list</i></b> found.", "red")
     counter.increment_checks()
 
 
@@ -229,7 +222,6 @@ def check_views(outputter):
     check_viewports_have_correct_types(views, outputter)
 
     outputter.print_md("### 3. Schedule check:")
-    schedules = views.get("Schedule", [])
-    check_schedule_names_and_get_material_schedule(schedules, outputter)
+    check_schedule_names_and_get_material_schedule(outputter)
 
     return counter
\ No newline at end of file
@@ -1,14 +1,127 @@
 from src.load_input_form import show_input_form
-from src.calculate_load_Information import calculate_load_information
-from src.update_load_parameters import update_load_parameters
+from src.update_load_parameters import (
+    update_load_parameters,
+    get_level_heights,
+    get_element_heights,
+    collect_load_elements,
+    collect_anchors,
+    collect_leg_components
+)
+from src.anchor_forces import calculate_anchor_forces, find_overloaded_anchors, format_anchor_params
+from src.leg_loads import calculate_leg_loads, get_leg_load_columns, get_top_leg_forces, format_leg_params
+from src.load_combinations import generate_load_combinations, find_governing_combinations
+from src.load_cache import (
+    get_cache_path,
+    load_cache,
+    save_cache,
+    get_load_information,
+    get_level_load_information,
+    get_element_load_information,
+    format_cache_statistics
+)
+from outputter import Outputter
+from pyrevit import forms
 
+TOP_LEGS = 10
+CALCULATE = "Calculate"
+ELEMENT_LOADS = "Per-element loads"
+ANCHOR_FORCES = "Anchor forces"
+LEG_FORCES = "Leg forces"
+CALCULATION_OPTIONS = [ELEMENT_LOADS, ANCHOR_FORCES, LEG_FORCES]
+
+def select_calculation_options():
+    """Asks which per-element calculations are run in addition to the project and level load
+    parameters when the button is shift-clicked.
+
+    Returns:
+        list: Names of the selected calculation options. None if the selection was cancelled.
+    """
+
+    if not __shiftclick__:
+        return []
+
+    result = forms.CommandSwitchWindow.show(
+        [CALCULATE],
+        switches=CALCULATION_OPTIONS,
+        message="Load calculation options"
+    )
+    if result is None: # Dialog was cancelled
+        return None
+
+    _, switches = result
+    return [option for option in CALCULATION_OPTIONS if switches.get(option)]
+
+def merge_element_params(element_params, new_params):
+    for element_id, params in new_params.items():
+        params.update(element_params.get(element_id, {})) # Element params of the same height bucket are shared, so they are not modified
+        element_params[element_id] = params
+
+def calculate_design_leg_forces(leg_loads, input_params):
+    """Finds the governing ULS combination of each leg.
+
+    Returns:
+        tuple: Dictionary of element id and design leg force (kN) and dictionary of element id and governing combination name.
+    """
+
+    element_ids, load_columns = get_leg_load_columns(leg_loads)
+    governing = find_governing_combinations(load_columns, generate_load_combinations(input_params["A2"], input_params["A4"]))
+    leg_forces = {element_id: force for element_id, (force, _) in zip(element_ids, governing)}
+    leg_combinations = {element_id: name for element_id, (_, name) in zip(element_ids, governing)}
+    return leg_forces, leg_combinations
+
+def report_top_legs(outputter, top_legs, leg_combinations):
+    if not top_legs:
+        return
+    outputter.print_table(
+        [[outputter.linkify(element_id), "{:.2f}".format(force), leg_combinations[element_id]] for element_id, force in top_legs],
+        columns=["Base plate", "Leg force (kN)", "Governing combination"],
+        title="Most loaded legs"
+    )
+
+def report_overloaded_anchors(outputter, overloaded_anchors):
+    for element_id, force, capacity in overloaded_anchors:
+        outputter.print_response(
+            "Anchor {}".format(outputter.linkify(element_id)),
+            "Design force {0:.2f} kN exceeds capacity {1:.2f} kN".format(force, capacity),
+            "red"
+        )
+
+def report_cache_statistics(outputter, cache):
+    outputter.print_response("Load calculation cache", format_cache_statistics(cache))
 
 def main():
+    options = select_calculation_options()
+    if options is None:
+        return
+
     input_params = show_input_form()
     if input_params:
-        load_params = calculate_load_information(input_params)
-        update_load_parameters(load_params)
+        outputter = Outputter()
+        cache_path = get_cache_path()
+        cache = load_cache(cache_path)
+        load_params = get_load_information(cache, input_params)
+        element_params = get_level_load_information(cache, input_params, get_level_heights())
+        if ELEMENT_LOADS in options: # Per-element loads at the height of each scaffolding component
+            element_params.update(get_element_load_information(cache, input_params, get_element_heights(collect_load_elements())))
+        save_cache(cache_path, cache)
+
+        overloaded_anchors = []
+        if ANCHOR_FORCES in options:
+            anchors, anchor_capacities = collect_anchors()
+            anchor_forces = calculate_anchor_forces(anchors, input_params)
+            merge_element_params(element_params, format_anchor_params(anchor_forces))
+            overloaded_anchors = find_overloaded_anchors(anchor_forces, anchor_capacities)
+
+        leg_forces, leg_combinations = {}, {}
+        if LEG_FORCES in options:
+            plates, components = collect_leg_components()
+            leg_forces, leg_combinations = calculate_design_leg_forces(calculate_leg_loads(plates, components, input_params), input_params)
+            merge_element_params(element_params, format_leg_params(leg_forces))
+
+        update_load_parameters(load_params, element_params)
+        report_overloaded_anchors(outputter, overloaded_anchors)
+        report_top_legs(outputter, get_top_leg_forces(leg_forces, TOP_LEGS), leg_combinations)
+        report_cache_statistics(outputter, cache)
 
 if __name__ == "__main__":
     main()
-
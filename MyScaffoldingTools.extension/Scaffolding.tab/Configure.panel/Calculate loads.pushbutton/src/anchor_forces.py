@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Anchor force calculation. Wind load of the facade is divided to the anchors by their tributary
+areas. Anchors are grouped by facade and into rows by height, and the tributary area of each anchor
+extends half way to the neighbouring anchors of the same row and half way to the neighbouring rows.
+Rows and anchors within a row are handled as sorted sweeps, so the calculation is O(n log n).
+"""
+
+from collections import namedtuple
+
+from src.calculate_load_Information import (
+    calculate_peak_velocity_pressures,
+    calculate_k_factor,
+    get_wind_input,
+    bucket_height,
+    WALL_PRESSURE,
+    WALL_SUCTION
+)
+
+ANCHOR_FORCE_PARAM = "Anchor force"
+ANCHOR_CAPACITY_PARAM = "Max X+"
+ROW_TOLERANCE = 0.3 # m, anchors within the tolerance are on the same row
+WIND_PARTIAL_FACTOR = 1.5
+
+# Position is the horizontal coordinate along the facade and height the height from the ground, both in meters
+Anchor = namedtuple("Anchor", ["element_id", "facade", "position", "height"])
+
+def group_anchor_rows(anchors, tolerance=ROW_TOLERANCE):
+    """Groups anchors of a single facade into rows by their height.
+
+    Args:
+        anchors (list): List of Anchor tuples.
+        tolerance (float, optional): Maximum height difference of the anchors on the same row. Defaults to ROW_TOLERANCE.
+
+    Returns:
+        list: List of rows from the lowest. Row is list of Anchor tuples sorted by position.
+    """
+
+    rows = []
+    for anchor in sorted(anchors, key=lambda anchor: anchor.height):
+        if rows and anchor.height - rows[-1][0].height <= tolerance:
+            rows[-1].append(anchor)
+        else:
+            rows.append([anchor])
+
+    return [sorted(row, key=lambda anchor: anchor.position) for row in rows]
+
+def calculate_extents(coordinates, default_spacing):
+    """Calculates extent of each coordinate half way to its neighbours. Extent at the ends
+    is the same than the extent towards the only neighbour.
+
+    Args:
+        coordinates (list): Sorted list of coordinates.
+        default_spacing (float): Spacing used if there is only one coordinate.
+
+    Returns:
+        list: List of extents in the same order than coordinates.
+    """
+
+    if len(coordinates) == 1:
+        return [default_spacing]
+
+    gaps = [coordinates[i + 1] - coordinates[i] for i in range(len(coordinates) - 1)]
+    return [gaps[0]] + [(gaps[i - 1] + gaps[i]) / 2.0 for i in range(1, len(gaps))] + [gaps[-1]]
+
+def calculate_row_heights(row_heights, top_height):
+    """Calculates height of the facade strip carried by each anchor row. The lowest row carries half
+    of the height below it (rest is carried by the base plates) and the highest row carries
+    everything above it up to the top of the scaffolding.
+
+    Args:
+        row_heights (list): Sorted list of row heights in meters.
+        top_height (float): Height of the scaffolding top in meters.
+
+    Returns:
+        list: List of strip heights in the same order than rows.
+    """
+
+    strip_heights = []
+    for i, height in enumerate(row_heights):
+        lower = (row_heights[i - 1] + height) / 2.0 if i > 0 else height / 2.0
+        upper = (height + row_heights[i + 1]) / 2.0 if i < len(row_heights) - 1 else max(top_height, height)
+        strip_heights.append(upper - lower)
+
+    return strip_heights
+
+def calculate_tributary_areas(anchors, top_height, bay_length):
+    """Calculates tributary facade area of each anchor.
+
+    Args:
+        anchors (list): List of Anchor tuples.
+        top_height (float): Height of the scaffolding top in meters.
+        bay_length (float): Bay length in meters. Used as width if a row has only one anchor.
+
+    Returns:
+        dict: Dictionary where key is element id and value is tributary area in m2.
+    """
+
+    facades = {}
+    for anchor in anchors:
+        facades.setdefault(anchor.facade, []).append(anchor)
+
+    areas = {}
+    for facade_anchors in facades.values():
+        rows = group_anchor_rows(facade_anchors)
+        strip_heights = calculate_row_heights([row[0].height for row in rows], top_height)
+
+        for row, strip_height in zip(rows, strip_heights):
+            widths = calculate_extents([anchor.position for anchor in row], bay_length)
+            for anchor, width in zip(row, widths):
+                areas[anchor.element_id] = width * strip_height
+
+    return areas
+
+def calculate_anchor_forces(anchors, load_input):
+    """Calculates design anchor forces from the tributary areas, peak velocity pressure at the anchor
+    height and the governing wall pressure coefficient. Force is multiplied by the partial factor of
+    wind and K factor of the consequence class. Peak velocity pressure is calculated once per height bucket.
+
+    Args:
+        anchors (list): List of Anchor tuples.
+        load_input (dict): Input values of the load input form.
+
+    Returns:
+        dict: Dictionary where key is element id and value is design anchor force in kN.
+    """
+
+    if not anchors:
+        return {}
+
+    top_height = max(load_input["C1"], max(anchor.height for anchor in anchors))
+    areas = calculate_tributary_areas(anchors, top_height, load_input["C3"])
+
+    anchor_buckets = {anchor.element_id: bucket_height(anchor.height) for anchor in anchors}
+    heights = sorted(set(anchor_buckets.values()))
+    pressures = dict(zip(heights, calculate_peak_velocity_pressures(heights=heights, **get_wind_input(load_input))))
+
+    coefficient = max(abs(WALL_PRESSURE), abs(WALL_SUCTION))
+    factor = coefficient * WIND_PARTIAL_FACTOR * calculate_k_factor(load_input["A4"])
+
+    return {element_id: factor * pressures[anchor_buckets[element_id]] * area for element_id, area in areas.items()}
+
+def find_overloaded_anchors(anchor_forces, anchor_capacities):
+    """Finds anchors whose design force exceeds their capacity. Anchors without capacity are not checked.
+
+    Args:
+        anchor_forces (dict): Dictionary where key is element id and value is design anchor force in kN.
+        anchor_capacities (dict): Dictionary where key is element id and value is anchor capacity in kN.
+
+    Returns:
+        list: List of tuples of element id, force and capacity sorted by utilisation from the highest.
+    """
+
+    overloaded = [
+        (element_id, force, anchor_capacities[element_id])
+        for element_id, force in anchor_forces.items()
+        if anchor_capacities.get(element_id) and force > anchor_capacities[element_id]
+    ]
+
+    return sorted(overloaded, key=lambda anchor: anchor[1] / anchor[2], reverse=True)
+
+def format_anchor_params(anchor_forces):
+    return {element_id: {ANCHOR_FORCE_PARAM: "{:.2f}".format(force).replace(".", ",")} for element_id, force in anchor_forces.items()}
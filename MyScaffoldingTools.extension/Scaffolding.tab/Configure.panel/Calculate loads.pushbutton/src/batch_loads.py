@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Headless batch calculation of load parameters without Revit.
+
+Reads a csv file of sites where each row contains a site name and the inputs of the load input
+form (A1 - C4) and writes the formatted load parameters of every site into a csv or json file,
+depending on the file extension. Decimal comma and the labels of the form choices (ie. FIN, CC2,
+II) are accepted, for example:
+
+    Site;A1;A2;A3;A4;B1;B2;B3;B4;B5;C1;C2;C3;C4
+    Site 1;FIN;1,50;2,00;CC2;21;II;5;1;1;20;32,5;2,572;18
+
+Usage:
+    python "src/batch_loads.py" SITES_CSV OUTPUT_FILE [--processes N]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from multiprocessing import Pool, cpu_count
+
+BUTTON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BUTTON_DIR not in sys.path:
+    sys.path.insert(0, BUTTON_DIR)
+
+from src.calculate_load_Information import calculate_load_information, INPUT_CHOICES
+
+SITE_HEADER = "Site"
+INPUT_KEYS = ["A1", "A2", "A3", "A4", "B1", "B2", "B3", "B4", "B5", "C1", "C2", "C3", "C4"]
+
+def convert_input_value(key, text):
+    """Converts csv cell into the same value than the load input form.
+
+    Args:
+        key (str): Key of the load input form (A1 - C4).
+        text (str): Cell text.
+
+    Returns:
+        float: Input value. Integer for the choices of the form.
+    """
+
+    text = text.strip()
+    if text.upper() in INPUT_CHOICES.get(key, {}):
+        return INPUT_CHOICES[key][text.upper()]
+
+    value = float(text.replace(",", "."))
+    if value < 0.0:
+        raise ValueError("Invalid input for {0}: {1}".format(key, text))
+
+    return int(value) if key in INPUT_CHOICES else value
+
+def read_sites_csv(file_path):
+    """Reads sites csv file. Delimiter is detected from the file content.
+
+    Args:
+        file_path (str): Path to the sites csv file.
+
+    Returns:
+        list: List of tuples of site name and row dictionary of cell texts.
+    """
+
+    with open(file_path) as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        rows = [row for row in csv.DictReader(f, dialect=dialect) if any((value or "").strip() for value in row.values())]
+
+    return [(row.get(SITE_HEADER) or str(index), row) for index, row in enumerate(rows, 1)]
+
+def calculate_site(task):
+    """Calculates load parameters of a single site.
+
+    Args:
+        task (tuple): Site name and row dictionary of cell texts.
+
+    Returns:
+        tuple: Site name, dictionary of load parameters and error message (None if succeeded).
+    """
+
+    site, row = task
+    try:
+        load_input = {key: convert_input_value(key, row[key]) for key in INPUT_KEYS}
+        return site, calculate_load_information(load_input), None
+    except Exception as error:
+        return site, {}, str(error)
+
+def calculate_sites(sites, processes=None):
+    """Calculates load parameters of all sites using a process pool. Order of the sites is kept.
+
+    Args:
+        sites (list): List of tuples of site name and row dictionary of cell texts.
+        processes (int, optional): Number of worker processes. Defaults to None, which uses number of CPUs.
+
+    Returns:
+        list: List of tuples of site name, dictionary of load parameters and error message.
+    """
+
+    pool = Pool(processes or cpu_count())
+    try:
+        results = pool.map(calculate_site, sites, chunksize=max(1, len(sites) // (4 * (processes or cpu_count()))))
+    finally:
+        pool.close()
+        pool.join()
+
+    return results
+
+def format_csv_value(value):
+    # Multi-line values, eg. wind load zones, are kept on the row of the site
+    if hasattr(value, "splitlines"):
+        return "; ".join(line.strip() for line in value.splitlines() if line.strip())
+    return value
+
+def write_results_csv(file_path, results):
+    headers = []
+    for _, load_params, _ in results:
+        headers.extend(name for name in load_params if name not in headers)
+
+    with open(file_path, "w") as f:
+        writer = csv.writer(f, delimiter=";", lineterminator="\n")
+        writer.writerow([SITE_HEADER] + headers + ["Error"])
+        for site, load_params, error in results:
+            writer.writerow([site] + [format_csv_value(load_params.get(name, "")) for name in headers] + [error or ""])
+
+def write_results_json(file_path, results):
+    with open(file_path, "w") as f:
+        json.dump([{"site": site, "load_params": load_params, "error": error} for site, load_params, error in results], f, indent=2, sort_keys=True)
+
+def write_results(file_path, results):
+    """Writes load parameters into csv or json file depending on the file extension.
+
+    Args:
+        file_path (str): Path to the output file (.csv or .json).
+        results (list): List of tuples of site name, dictionary of load parameters and error message.
+    """
+
+    if file_path.lower().endswith(".json"):
+        write_results_json(file_path, results)
+    else:
+        write_results_csv(file_path, results)
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculate load parameters of sites without Revit.")
+    parser.add_argument("sites_csv", help="Csv file of site names and load input form values (A1 - C4).")
+    parser.add_argument("output_file", help="Output csv or json file.")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes. Defaults to number of CPUs.")
+    args = parser.parse_args()
+
+    results = calculate_sites(read_sites_csv(args.sites_csv), args.processes)
+    write_results(args.output_file, results)
+    failed = [result for result in results if result[2]]
+
+    for site, _, error in failed:
+        print("FAILED {0}: {1}".format(site, error))
+
+    print("Calculated {0} of {1} sites -> {2}".format(len(results) - len(failed), len(results), args.output_file))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
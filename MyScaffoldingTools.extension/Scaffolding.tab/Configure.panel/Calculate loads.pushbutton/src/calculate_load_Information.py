@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import math
-from pyrevit import revit, DB
+from functools import wraps
 
 WALL_PRESSURE = 0.8
 WALL_SUCTION = -0.5
@@ -10,7 +10,39 @@ MONOPITCH_SUCTION_DS = -0.9
 Z_ZERO = [0.003, 0.01, 0.05, 0.3, 1]
 Z_MIN = [1, 1, 2, 5, 10]
 TERRAIN_FACTOR_FIN = 0.18
-
+LIFT_HEIGHT = 2.0
+ELEVATION_BUCKET = 0.5
+PRESSURE_SURFACES = [
+    "Wall pressure",
+    "Wall suction",
+    "Roof pressure",
+    "Double-pitch roof suction",
+    "Mono-pitch roof suction to up slope",
+    "Mono-pitch roof suction to down slope"
+]
+ELEMENT_LOAD_PARAMS = ["Peak velocity pressure"] + ["{} load".format(surface) for surface in PRESSURE_SURFACES]
+# Values of the choices of the load input form by the input key and the choice label
+INPUT_CHOICES = {
+    "A1": {"FIN": 1, "ENG": 2, "SWE": 3},
+    "A4": {"CC1": 1, "CC2": 2, "CC3": 3},
+    "B2": {"0": 0, "I": 1, "II": 2, "III": 3, "IV": 4}
+}
+
+def memoize(function):
+    """Caches results of a pure function by its arguments."""
+
+    cache = {}
+
+    @wraps(function)
+    def memoized(*args, **kwargs):
+        key = args + tuple(sorted(kwargs.items()))
+        if key not in cache:
+            cache[key] = function(*args, **kwargs)
+        return cache[key]
+
+    return memoized
+
+@memoize
 def calculate_propability_factor(return_period, shape_parameter=0.2, cprob_exponent=0.5):
     """Probability factor is used to modify fundamental basic wind velocity vb which has mean return period
         of 50 years. The 10 minutes mean wind velocity having the probability p for an annual exceedence is determined
@@ -48,6 +80,7 @@ def calculate_propability_factor(return_period, shape_parameter=0.2, cprob_expon
     
     return cprob
 
+@memoize
 def calculate_terrain_factor(fin, terrain_category):
     """Terrain factor is calculated using formula kr = 0.19 ⋅ (z0 / z0,II) ^ 0.07
         where:
@@ -158,6 +191,108 @@ def calculate_peak_velocity_pressure(
         "Peak wind speed": peak_wind_speed
     }
 
+def calculate_peak_velocity_pressures(
+    fin,
+    terrain_category,
+    return_period,
+    heights,
+    fundamental_basic_wind_velocity,
+    seasonal_factor=1.0,
+    orography_factor=1.0,
+    air_density=1.25,
+    directional_factor=1.0,
+    turbulence_factor=1.0
+):
+    """Calculate peak velocity pressures for multiple heights according to EN 1991-1-4 using the same
+        expressions than calculate_peak_velocity_pressure. Probability factor, basic wind velocity and
+        terrain factor do not depend on the height, so they are calculated only once. For each height
+        only the logarithm ln(max{ze, zmin} / z0) is calculated and the peak velocity pressure is:
+
+        qp(ze) = (1 + 7 ⋅ kI / (c0 ⋅ ln)) ⋅ (1/2) ⋅ p ⋅ (kr ⋅ ln ⋅ c0 ⋅ vb)^2
+
+    Args:
+        fin (bool): To determine whether finnish NA needs to be used or not.
+        terrain_category (int): Value between 0 - 4 to determine roughness and turbulence factors.
+        return_period (float): Return period in years to calculate probability for an annual exceedence.
+        heights (list): Heights from the ground in meters.
+        fundamental_basic_wind_velocity (float): is the fundamental value of the basic wind velocity in m/s.
+        seasonal_factor (float, optional): The value of seasonal factor. Defaults to 1.0.
+        orography_factor (float, optional): Orography factor. Defaults to 1.0.
+        air_density (float, optional): Air density. Defaults to 1.25.
+        directional_factor (float, optional): The value of directional factor. Defaults to 1.0.
+        turbulence_factor (float, optional): The value of the turbulence factor. Defaults to 1.0.
+
+    Returns:
+        list: Peak velocity pressures in kN/m2 in the same order than heights.
+    """
+
+    z_zero = Z_ZERO[terrain_category]
+    z_min = Z_MIN[terrain_category]
+    basic_wind_velocity = fundamental_basic_wind_velocity * calculate_propability_factor(return_period) * seasonal_factor * directional_factor
+    terrain_factor = calculate_terrain_factor(fin, terrain_category)
+    pressure_factor = 1/2000.0 * air_density * (terrain_factor * orography_factor * basic_wind_velocity) ** 2
+    turbulence = 7 * turbulence_factor / orography_factor
+    log = math.log
+
+    logs = [log(max(min(200, height), z_min) / z_zero) for height in heights]
+
+    return [(1 + turbulence / height_log) * pressure_factor * height_log * height_log for height_log in logs]
+
+def create_wind_load_zones(height, zone_height=LIFT_HEIGHT):
+    """Divides the structure height into zones (ie. scaffolding lifts) from the ground.
+    The topmost zone ends at the structure height.
+
+    Args:
+        height (float): Structure height from the ground in meters.
+        zone_height (float, optional): Height of a single zone in meters. Defaults to LIFT_HEIGHT.
+
+    Returns:
+        list: List of tuples of zone bottom and top heights in meters.
+    """
+
+    number_of_zones = max(int(math.ceil(height / zone_height - 1e-9)), 1)
+    return [(i * zone_height, min((i + 1) * zone_height, height)) for i in range(number_of_zones)]
+
+def calculate_wind_load_zones(wind_input, height, zone_height=LIFT_HEIGHT):
+    """Calculates height-zoned peak velocity pressures. Pressure of each zone is calculated at
+    the top of the zone. Zones with the same pressure (ie. below minimum height) are merged.
+
+    Args:
+        wind_input (dict): Keyword arguments of calculate_peak_velocity_pressures without heights.
+        height (float): Structure height from the ground in meters.
+        zone_height (float, optional): Height of a single zone in meters. Defaults to LIFT_HEIGHT.
+
+    Returns:
+        list: List of tuples of zone bottom height, top height and peak velocity pressure.
+    """
+
+    zones = create_wind_load_zones(height, zone_height)
+    pressures = calculate_peak_velocity_pressures(heights=[top for _, top in zones], **wind_input)
+    load_zones = []
+
+    for (bottom, top), pressure in zip(zones, pressures):
+        if load_zones and round(load_zones[-1][2], 2) == round(pressure, 2):
+            load_zones[-1] = (load_zones[-1][0], top, pressure)
+        else:
+            load_zones.append((bottom, top, pressure))
+
+    return load_zones
+
+def format_wind_load_zones(load_zones):
+    """Formats wind load zones into multiline text.
+
+    Args:
+        load_zones (list): List of tuples of zone bottom height, top height and peak velocity pressure.
+
+    Returns:
+        str: One line per zone, for example "0,0 - 2,0 m: 0,45".
+    """
+
+    return "\n".join(
+        "{0:.1f} - {1:.1f} m: {2:.2f}".format(bottom, top, pressure).replace(".", ",")
+        for bottom, top, pressure in load_zones
+    )
+
 def calculate_roof_suction(angle, width):
     """Calculate external roof suction pressure coefficient according to EN 16508
         using roof angle and roof width.
@@ -205,6 +340,24 @@ def calculate_pressure_coefficents(angle, width):
 
     return coefficients
 
+def calculate_imposed_load_combination_factor(imposed_load):
+    """Returns combination factor of the imposed load based on EN 12811-1.
+
+    Args:
+        imposed_load (float): Imposed load in kN/m2.
+
+    Returns:
+        float: Combination factor.
+    """
+
+    if imposed_load <= 0.75:
+        return 0.0
+    if imposed_load <= 2.00:
+        return 0.25
+    if imposed_load <= 6.00:
+        return 0.5
+    return 1.0
+
 def format_imposed_loads(imposed_load):
     """Formats response according to imposed load value. Includes imposed load
         and combination factor based on EN 12811-1. Converts imposed load value from kilograms to kilonewtons.
@@ -216,16 +369,26 @@ def format_imposed_loads(imposed_load):
         dict: Multiline string of the imposed load information.
     """
 
-    combination_factor = "1,00"
-    if imposed_load <= 0.75:
-        combination_factor = "0,00"
-    if 0.75 < imposed_load <= 2.00:
-        combination_factor = "0,25"
-    if 2.00 < imposed_load <= 6.00:
-        combination_factor = "0,50"
+    combination_factor = "{:.2f}".format(calculate_imposed_load_combination_factor(imposed_load)).replace(".", ",")
 
     return {"Imposed loads": "{:.2f}".format(imposed_load).replace(".", ","), "Imposed load combination factor": combination_factor}
 
+def calculate_k_factor(consequence_class):
+    """Returns K factor (KFI) according to consequence class based on EN 1990.
+
+    Args:
+        consequence_class (int): Consequence class (CC1, CC2, or CC3)
+
+    Returns:
+        float: K factor.
+    """
+
+    if (consequence_class == 1):
+        return 0.9
+    if (consequence_class == 3):
+        return 1.1
+    return 1.0
+
 def format_consequence_class(consequence_class):
     """Calculates K factor according to consequence class based on EN 1990 and creates response
         in dictionary format.
@@ -237,11 +400,7 @@ def format_consequence_class(consequence_class):
         dict: Dictionary where key is formatted consequence class and value is K factor.
     """
 
-    k_factor = "1,00"
-    if (consequence_class == 1):
-        k_factor = "0,90"
-    if (consequence_class == 3):
-        k_factor = "1,10"
+    k_factor = "{:.2f}".format(calculate_k_factor(consequence_class)).replace(".", ",")
 
     return {"Consequence class": "CC{}".format(consequence_class), "K factor": k_factor}
 
@@ -283,33 +442,118 @@ def format_load_parameters(
 
     return formatted_load_params
 
+def get_wind_input(load_input):
+    """Collects height independent wind calculation arguments from the form input.
+
+    Returns:
+        dict: Keyword arguments of calculate_peak_velocity_pressures without heights.
+    """
+
+    return {
+        "fin": load_input["A1"] == 1,
+        "terrain_category": load_input["B2"],
+        "return_period": load_input["B3"],
+        "fundamental_basic_wind_velocity": load_input["B1"],
+        "seasonal_factor": load_input["B4"],
+        "orography_factor": load_input["B5"]
+    }
+
+def calculate_level_load_information(load_input, level_heights):
+    """Calculates peak velocity pressure and wall pressure line load at the height of each level.
+
+    Args:
+        load_input (dict): Input values of the load input form.
+        level_heights (dict): Dictionary where key is level id and value is level height from the ground in meters.
+
+    Returns:
+        dict: Dictionary where key is level id and value is dictionary of parameter name and formatted value.
+    """
+
+    level_ids = list(level_heights.keys())
+    pressures = calculate_peak_velocity_pressures(heights=[level_heights[level_id] for level_id in level_ids], **get_wind_input(load_input))
+    line_factor = WALL_PRESSURE * load_input["C3"]
+
+    return {
+        level_id: {
+            "Peak velocity pressure": "{:.2f}".format(pressure).replace(".", ","),
+            "Wall pressure load": "{:.2f}".format(pressure * line_factor).replace(".", ",")
+        }
+        for level_id, pressure in zip(level_ids, pressures)
+    }
+
+def calculate_load_values(load_input):
+    """Calculates wind parameters and pressure coefficients from the form input without formatting.
+
+    Args:
+        load_input (dict): Input values of the load input form.
+
+    Returns:
+        tuple: Dictionary of wind parameters, dictionary of pressure coefficients and roof angle.
+    """
+
+    roof_width = load_input["C2"]
+    angle = 0 if roof_width == 0 else load_input["C4"]
+
+    wind_calculation_params = calculate_peak_velocity_pressure(
+        load_input["A1"] == 1,
+        load_input["B2"],
+        load_input["B3"],
+        load_input["C1"],
+        load_input["B1"],
+        load_input["B4"],
+        load_input["B5"]
+    )
+
+    return wind_calculation_params, calculate_pressure_coefficents(angle, roof_width), angle
+
+def bucket_height(height, bucket=ELEVATION_BUCKET):
+    """Rounds height up to the next bucket, so each bucket is calculated with its top height."""
+
+    return max(int(math.ceil(height / bucket - 1e-9)), 0) * bucket
+
+def calculate_element_load_information(load_input, element_heights, bucket=ELEVATION_BUCKET):
+    """Calculates peak velocity pressure and line loads of the pressure surfaces at the height of
+    each element. Heights are rounded up into buckets and each unique bucket is calculated and
+    formatted only once, so elements in the same bucket share the same parameter values.
+
+    Args:
+        load_input (dict): Input values of the load input form.
+        element_heights (dict): Dictionary where key is element id and value is element height from the ground in meters.
+        bucket (float, optional): Height bucket in meters. Defaults to ELEVATION_BUCKET.
+
+    Returns:
+        dict: Dictionary where key is element id and value is dictionary of parameter name and formatted value.
+    """
+
+    element_buckets = {element_id: bucket_height(height, bucket) for element_id, height in element_heights.items()}
+    heights = sorted(set(element_buckets.values()))
+    pressures = calculate_peak_velocity_pressures(heights=heights, **get_wind_input(load_input))
+    angle = 0 if load_input["C2"] == 0 else load_input["C4"]
+    pressure_coefficients = calculate_pressure_coefficents(angle, load_input["C2"])
+    bay_length = load_input["C3"]
+
+    bucket_params = {}
+    for height, pressure in zip(heights, pressures):
+        params = {"Peak velocity pressure": "{:.2f}".format(pressure).replace(".", ",")}
+        for surface in PRESSURE_SURFACES:
+            params["{} load".format(surface)] = "{:.2f}".format(pressure_coefficients[surface] * pressure * bay_length).replace(".", ",")
+        bucket_params[height] = params
+
+    return {element_id: bucket_params[height] for element_id, height in element_buckets.items()}
+
 def calculate_load_information(load_input):
-    finnish_na = True if load_input["A1"] == 1 else False
     imposed_load = load_input["A2"]
     snow_load = load_input["A3"]
     consequence_class = load_input["A4"]
-    fundamental_basic_wind_velocity = load_input["B1"]
     terrain_category = load_input["B2"]
     return_period = load_input["B3"]
-    seasonal_factor = load_input["B4"]
-    orography_factor = load_input["B5"]
     height = load_input["C1"]
     roof_width = load_input["C2"]
     bay_length = load_input["C3"]
-    angle = 0 if roof_width == 0 else load_input["C4"]
 
-    wind_calculation_params = calculate_peak_velocity_pressure(
-        finnish_na,
-        terrain_category,
-        return_period, height,
-        fundamental_basic_wind_velocity,
-        seasonal_factor,
-        orography_factor
-    )
-
-    pressure_coefficients = calculate_pressure_coefficents(angle, roof_width)
+    wind_calculation_params, pressure_coefficients, angle = calculate_load_values(load_input)
 
-    return format_load_parameters(
+    load_params = format_load_parameters(
         wind_calculation_params,
         pressure_coefficients,
         angle,
@@ -322,3 +566,6 @@ def calculate_load_information(load_input):
         snow_load,
         terrain_category
     )
+    load_params["Wind load zones"] = format_wind_load_zones(calculate_wind_load_zones(get_wind_input(load_input), height))
+
+    return load_params
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Inverse design of the load calculation. Solves the limiting height, bay length or return period
+where a load reaches the target value (ie. "how high can we go with 2,572 m bays before the anchor
+force exceeds 5 kN?"). All loads grow monotonically with these inputs, so the limit is found with
+bisection. Scenarios are solved together: every iteration evaluates the midpoints of all unsolved
+scenarios, so a whole capacity chart is solved in the same number of iterations than one scenario.
+
+Example:
+    rows = create_capacity_chart(base_input, "Height above ground", "Anchor force", 5.0, "Bay length", [2.07, 2.572, 3.07])
+"""
+
+from src.calculate_load_Information import calculate_load_values, calculate_k_factor, WALL_PRESSURE, WALL_SUCTION
+from src.anchor_forces import WIND_PARTIAL_FACTOR
+from src.load_sweep import INPUT_KEYS
+
+# Solvable inputs and their search bounds
+SOLVE_BOUNDS = {
+    "Height above ground": (0.0, 200.0),
+    "Bay length": (0.0, 20.0),
+    "Return period": (2.0, 1000.0)
+}
+ANCHOR_FORCE = "Anchor force"
+ANCHOR_SPACING = 4.0 # m, vertical spacing of the anchors
+TOLERANCE = 0.001
+MAX_ITERATIONS = 60
+
+def calculate_load_value(load_input, load_name, anchor_spacing=ANCHOR_SPACING):
+    """Calculates absolute value of a single load.
+
+    Args:
+        load_input (dict): Input values of the load input form.
+        load_name (str): "Peak velocity pressure", line load of a pressure surface (ie. "Wall pressure load")
+            or "Anchor force" of an anchor in every bay with the given vertical spacing.
+        anchor_spacing (float, optional): Vertical spacing of the anchors in meters. Defaults to ANCHOR_SPACING.
+
+    Returns:
+        float: Load in kN/m2, kN/m or kN.
+    """
+
+    wind_calculation_params, pressure_coefficients, _ = calculate_load_values(load_input)
+    peak_velocity_pressure = wind_calculation_params["Peak velocity pressure"]
+
+    if load_name == "Peak velocity pressure":
+        return peak_velocity_pressure
+
+    line_load = peak_velocity_pressure * load_input["C3"]
+    if load_name == ANCHOR_FORCE:
+        coefficient = max(abs(WALL_PRESSURE), abs(WALL_SUCTION))
+        return coefficient * line_load * anchor_spacing * WIND_PARTIAL_FACTOR * calculate_k_factor(load_input["A4"])
+
+    return abs(pressure_coefficients[load_name[:-len(" load")]] * line_load)
+
+def solve_limits(scenarios, variable, load_name, target, anchor_spacing=ANCHOR_SPACING, tolerance=TOLERANCE):
+    """Solves the largest value of the variable where the load does not exceed the target for every scenario.
+
+    Args:
+        scenarios (list): List of load inputs (A1 - C4).
+        variable (str): Name of the solved input (see SOLVE_BOUNDS).
+        load_name (str): Name of the load (see calculate_load_value).
+        target (float): Target load.
+        anchor_spacing (float, optional): Vertical spacing of the anchors in meters. Defaults to ANCHOR_SPACING.
+        tolerance (float, optional): Accuracy of the solved value. Defaults to TOLERANCE.
+
+    Returns:
+        list: Limiting value of each scenario. None if the target is exceeded already at the lower bound.
+            Upper bound if the target is not reached inside the bounds.
+    """
+
+    key = INPUT_KEYS[variable]
+    lower_bound, upper_bound = SOLVE_BOUNDS[variable]
+    inputs = [dict(scenario) for scenario in scenarios]
+
+    def evaluate(indexes, values):
+        for index, value in zip(indexes, values):
+            inputs[index][key] = value
+        return [calculate_load_value(inputs[index], load_name, anchor_spacing) for index in indexes]
+
+    indexes = list(range(len(inputs)))
+    lower_loads = evaluate(indexes, [lower_bound] * len(indexes))
+    upper_loads = evaluate(indexes, [upper_bound] * len(indexes))
+    limits = [None if lower_load > target else upper_bound for lower_load in lower_loads]
+    lows = [lower_bound] * len(inputs)
+    highs = [upper_bound] * len(inputs)
+    active = [index for index in indexes if lower_loads[index] <= target < upper_loads[index]]
+
+    for _ in range(MAX_ITERATIONS):
+        if not active:
+            break
+        middles = [(lows[index] + highs[index]) / 2.0 for index in active]
+        for index, middle, load in zip(active, middles, evaluate(active, middles)):
+            if load > target:
+                highs[index] = middle
+            else:
+                lows[index] = middle
+        active = [index for index in active if highs[index] - lows[index] > tolerance]
+
+    for index in indexes:
+        if lower_loads[index] <= target < upper_loads[index]:
+            limits[index] = lows[index]
+
+    return limits
+
+def create_capacity_chart(base_input, variable, load_name, target, sweep_name, sweep_values, anchor_spacing=ANCHOR_SPACING):
+    """Solves the limit of the variable for each value of another input.
+
+    Args:
+        base_input (dict): Input values of the load input form (A1 - C4).
+        variable (str): Name of the solved input (see SOLVE_BOUNDS).
+        load_name (str): Name of the load (see calculate_load_value).
+        target (float): Target load.
+        sweep_name (str): Name of the swept input (see load_sweep.INPUT_KEYS).
+        sweep_values (list): Values of the swept input.
+        anchor_spacing (float, optional): Vertical spacing of the anchors in meters. Defaults to ANCHOR_SPACING.
+
+    Returns:
+        tuple: List of headers and list of rows of swept value and limit. Can be written with load_sweep.write_sweep.
+    """
+
+    sweep_key = INPUT_KEYS[sweep_name]
+    scenarios = []
+    for value in sweep_values:
+        scenario = dict(base_input)
+        scenario[sweep_key] = value
+        scenarios.append(scenario)
+
+    limits = solve_limits(scenarios, variable, load_name, target, anchor_spacing)
+    headers = [sweep_name, "Maximum {0} ({1} {2:.2f})".format(variable.lower(), load_name.lower(), target)]
+
+    return headers, [[value, limit] for value, limit in zip(sweep_values, limits)]
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""Leg load estimation. Loads of the scaffolding are divided to the base plates (legs):
+
+- Self-weight of each component is shared equally by the base plates under its plan bounding box
+  or, if there is none, carried by the nearest base plate.
+- Imposed load, snow load, roof wind pressure and roof wind suction act on the plan area of each leg. Plan area
+  extends half way to the neighbouring legs of the same row and column, but at most half a bay.
+  Rows and columns are found in the local axes of the facade, so facades which are not parallel
+  to the project axes are grouped correctly.
+
+Base plates are stored into a grid index, so each component finds its base plates in constant time
+and the whole calculation is O(n log n).
+"""
+
+import math
+from collections import namedtuple
+
+from src.calculate_load_Information import (
+    calculate_peak_velocity_pressures,
+    calculate_pressure_coefficents,
+    get_wind_input
+)
+
+LEG_FORCE_PARAM = "Leg force"
+BASE_PLATE_PARAM = "Max Z+" # Parameter which identifies base plate families
+LEG_TOLERANCE = 0.1 # m, legs within the tolerance are on the same row or column
+GRAVITY = 9.81
+LOAD_CASES = ["Self-weight", "Imposed load", "Snow load", "Wind load", "Wind suction"]
+ROOF_SUCTIONS = ["Double-pitch roof suction", "Mono-pitch roof suction to up slope", "Mono-pitch roof suction to down slope"]
+
+# Coordinates are plan coordinates in meters, angle is the facade direction in degrees (0 - 90) and weight is in kilograms
+BasePlate = namedtuple("BasePlate", ["element_id", "x", "y", "angle"])
+Component = namedtuple("Component", ["min_x", "min_y", "max_x", "max_y", "weight"])
+
+class SpatialGrid(object):
+    """Grid index of the base plates in plan. Cell size should be about the bay length."""
+
+    def __init__(self, plates, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        for plate in plates:
+            self.cells.setdefault(self.get_cell(plate.x, plate.y), []).append(plate)
+        self.bounds = (
+            min(i for i, _ in self.cells), min(j for _, j in self.cells),
+            max(i for i, _ in self.cells), max(j for _, j in self.cells)
+        ) if self.cells else None
+
+    def get_cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Finds base plates inside the rectangle."""
+
+        min_cell = self.get_cell(min_x, min_y)
+        max_cell = self.get_cell(max_x, max_y)
+        plates = []
+        for i in range(min_cell[0], max_cell[0] + 1):
+            for j in range(min_cell[1], max_cell[1] + 1):
+                for plate in self.cells.get((i, j), ()):
+                    if min_x <= plate.x <= max_x and min_y <= plate.y <= max_y:
+                        plates.append(plate)
+        return plates
+
+    def nearest(self, x, y):
+        """Finds the nearest base plate by searching rings of cells around the point. Every plate in ring r
+        is at least (r - 1) * cell_size away, so search continues until the rings are farther than the best plate."""
+
+        if not self.cells:
+            return None
+
+        center = self.get_cell(x, y)
+        min_i, min_j, max_i, max_j = self.bounds
+        max_radius = max(abs(min_i - center[0]), abs(max_i - center[0]), abs(min_j - center[1]), abs(max_j - center[1]))
+        best = None
+        best_distance = None
+
+        for radius in range(max_radius + 1):
+            if best is not None and ((radius - 1) * self.cell_size) ** 2 > best_distance:
+                break
+            for i in range(center[0] - radius, center[0] + radius + 1):
+                for j in range(center[1] - radius, center[1] + radius + 1):
+                    if max(abs(i - center[0]), abs(j - center[1])) != radius:
+                        continue
+                    for plate in self.cells.get((i, j), ()):
+                        distance = (plate.x - x) ** 2 + (plate.y - y) ** 2
+                        if best is None or distance < best_distance:
+                            best, best_distance = plate, distance
+
+        return best
+
+def group_coordinates(items, key, tolerance=LEG_TOLERANCE):
+    """Groups items by a coordinate within tolerance.
+
+    Returns:
+        list: List of groups sorted by the coordinate.
+    """
+
+    groups = []
+    for item in sorted(items, key=key):
+        if groups and key(item) - key(groups[-1][0]) <= tolerance:
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return groups
+
+def get_facade_angle(direction_x, direction_y):
+    """Converts facing direction into the angle of the facade axes. Rows and columns are
+    the same when rotated by 90 degrees, so the angle is between 0 and 90 degrees.
+
+    Returns:
+        float: Angle in full degrees.
+    """
+
+    return round(math.degrees(math.atan2(direction_y, direction_x)) % 90.0) % 90.0
+
+def calculate_half_extents(coordinates, max_half_extent):
+    """Calculates extent of each coordinate half way to its neighbours. Gaps longer than a bay
+    (ie. between two scaffolds on the same line) separate the scaffolds, and ends extend only
+    to the inner side, since the scaffolding ends at the outermost legs.
+
+    Args:
+        coordinates (list): Sorted list of coordinates.
+        max_half_extent (float): Maximum extent to one side. Coordinate without any neighbours extends this much to both sides.
+
+    Returns:
+        list: List of extents in the same order than coordinates.
+    """
+
+    half_gaps = [(coordinates[i + 1] - coordinates[i]) / 2.0 for i in range(len(coordinates) - 1)]
+    sides = [None] + [half_gap if half_gap <= max_half_extent + LEG_TOLERANCE else None for half_gap in half_gaps] + [None]
+
+    extents = []
+    for before, after in zip(sides[:-1], sides[1:]):
+        if before is None and after is None:
+            extents.append(2 * max_half_extent)
+        else:
+            extents.append(min(before or 0.0, max_half_extent) + min(after or 0.0, max_half_extent))
+
+    return extents
+
+def calculate_plan_areas(plates, bay_length):
+    """Calculates plan area of each leg from its row and column neighbours. Rows and columns are
+    grouped in the local axes of each facade direction.
+
+    Args:
+        plates (list): List of BasePlate tuples.
+        bay_length (float): Bay length in meters. Half of it limits the extent to each side.
+
+    Returns:
+        dict: Dictionary where key is element id and value is plan area in m2.
+    """
+
+    areas = {}
+    for angle_group in group_coordinates(plates, lambda plate: plate.angle, 0.0):
+        angle = math.radians(angle_group[0].angle)
+        cos, sin = math.cos(angle), math.sin(angle)
+        local = {plate.element_id: (plate.x * cos + plate.y * sin, -plate.x * sin + plate.y * cos) for plate in angle_group}
+
+        widths = {}
+        for row in group_coordinates(angle_group, lambda plate: local[plate.element_id][1]):
+            row = sorted(row, key=lambda plate: local[plate.element_id][0])
+            for plate, width in zip(row, calculate_half_extents([local[plate.element_id][0] for plate in row], bay_length / 2.0)):
+                widths[plate.element_id] = width
+
+        for column in group_coordinates(angle_group, lambda plate: local[plate.element_id][0]):
+            column = sorted(column, key=lambda plate: local[plate.element_id][1])
+            for plate, depth in zip(column, calculate_half_extents([local[plate.element_id][1] for plate in column], bay_length / 2.0)):
+                areas[plate.element_id] = widths[plate.element_id] * depth
+
+    return areas
+
+def distribute_self_weight(plates, components, bay_length):
+    """Distributes self-weight of the components to the base plates.
+
+    Returns:
+        dict: Dictionary where key is element id of the base plate and value is self-weight in kN.
+    """
+
+    grid = SpatialGrid(plates, bay_length)
+    loads = {plate.element_id: 0.0 for plate in plates}
+
+    for component in components:
+        force = component.weight * GRAVITY / 1000
+        supports = grid.query(component.min_x, component.min_y, component.max_x, component.max_y)
+        if not supports:
+            nearest = grid.nearest((component.min_x + component.max_x) / 2.0, (component.min_y + component.max_y) / 2.0)
+            supports = [nearest] if nearest else []
+        for plate in supports:
+            loads[plate.element_id] += force / len(supports)
+
+    return loads
+
+def calculate_leg_loads(plates, components, load_input):
+    """Calculates characteristic load cases of each leg. Imposed load is applied to one working deck,
+    snow load and roof wind pressure and suction only if the scaffolding has a roof (roof width > 0).
+    Wind suction is the uplift (negative) of the most unfavourable roof suction coefficient.
+
+    Args:
+        plates (list): List of BasePlate tuples.
+        components (list): List of Component tuples.
+        load_input (dict): Input values of the load input form.
+
+    Returns:
+        dict: Dictionary where key is element id and value is dictionary of load case (see LOAD_CASES) and force in kN.
+    """
+
+    if not plates:
+        return {}
+
+    bay_length = load_input["C3"]
+    roof_width = load_input["C2"]
+    areas = calculate_plan_areas(plates, bay_length)
+    self_weights = distribute_self_weight(plates, components, bay_length)
+
+    roof_wind = 0.0
+    roof_suction = 0.0
+    snow_load = 0.0
+    if roof_width > 0:
+        coefficients = calculate_pressure_coefficents(load_input["C4"], roof_width)
+        peak_velocity_pressure = calculate_peak_velocity_pressures(heights=[load_input["C1"]], **get_wind_input(load_input))[0]
+        roof_wind = coefficients["Roof pressure"] * peak_velocity_pressure
+        roof_suction = min(coefficients[surface] for surface in ROOF_SUCTIONS) * peak_velocity_pressure
+        snow_load = load_input["A3"]
+
+    return {
+        plate.element_id: {
+            "Self-weight": self_weights[plate.element_id],
+            "Imposed load": load_input["A2"] * areas[plate.element_id],
+            "Snow load": snow_load * areas[plate.element_id],
+            "Wind load": roof_wind * areas[plate.element_id],
+            "Wind suction": roof_suction * areas[plate.element_id]
+        }
+        for plate in plates
+    }
+
+def get_leg_load_columns(leg_loads):
+    """Converts leg loads into columns for the load combinations.
+
+    Returns:
+        tuple: List of element ids and dictionary where key is load case and value is list of loads in the same order than element ids.
+    """
+
+    element_ids = list(leg_loads.keys())
+    return element_ids, {load_case: [leg_loads[element_id][load_case] for element_id in element_ids] for load_case in LOAD_CASES}
+
+def get_top_leg_forces(leg_forces, top_n=10):
+    """Returns the most loaded legs.
+
+    Returns:
+        list: List of tuples of element id and force in kN sorted from the highest absolute force.
+    """
+
+    return sorted(leg_forces.items(), key=lambda leg: abs(leg[1]), reverse=True)[:top_n]
+
+def format_leg_params(leg_forces):
+    return {element_id: {LEG_FORCE_PARAM: "{:.2f}".format(force).replace(".", ",")} for element_id, force in leg_forces.items()}
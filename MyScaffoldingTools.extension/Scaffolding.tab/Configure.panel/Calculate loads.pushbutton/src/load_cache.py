@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of the load calculation results. Results are stored in the pyRevit app data
+of the user, so the same input is calculated only once across all projects. Project-wide parameters
+are cached by the input and level and element parameters by the input and height, so each height
+bucket is calculated only once. Least recently used results are dropped when the cache is full.
+Hits and misses are counted in the same file.
+
+Cache is loaded once per run, used for all calculations and saved at the end:
+
+    cache = load_cache(get_cache_path())
+    load_params = get_load_information(cache, load_input)
+    element_params = get_element_load_information(cache, load_input, element_heights)
+    save_cache(get_cache_path(), cache)
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+try:
+    from pyrevit import script
+except ImportError: # Headless use outside of Revit
+    script = None
+
+from src import calculate_load_Information
+from src.calculate_load_Information import (
+    calculate_load_information,
+    calculate_level_load_information,
+    calculate_element_load_information,
+    bucket_height,
+    ELEVATION_BUCKET,
+    ELEMENT_LOAD_PARAMS
+)
+
+CACHE_FILE_ID = "load_calculation_cache"
+CACHE_SIZE = 2048 # Results of the height buckets are stored separately
+INPUT_PRECISION = 6
+
+def get_calculation_version():
+    """Hashes the source of the load calculation module, so results are dropped whenever the
+    calculation changes. Parameter names are hashed if the source is not available.
+
+    Returns:
+        str: Version hash.
+    """
+
+    hasher = hashlib.md5()
+    source_path = os.path.splitext(calculate_load_Information.__file__)[0] + ".py"
+    try:
+        with open(source_path, "rb") as f:
+            hasher.update(f.read())
+    except (IOError, OSError):
+        hasher.update(json.dumps(ELEMENT_LOAD_PARAMS).encode("utf-8"))
+    return hasher.hexdigest()
+
+CACHE_VERSION = get_calculation_version()
+
+def get_cache_path():
+    return script.get_universal_data_file(CACHE_FILE_ID, "json")
+
+def create_cache_key(load_input, kind="Project", height=None):
+    """Normalises load input into a key. Values are rounded, so ie. 20 and 20.0 have the same key.
+
+    Args:
+        load_input (dict): Input values of the load input form (A1 - C4).
+        kind (str, optional): Project, Level or Element. Defaults to "Project".
+        height (float, optional): Height of the level or element bucket in meters. Defaults to None.
+
+    Returns:
+        str: Kind, height and sorted input keys and values as json.
+    """
+
+    inputs = [[key, round(float(load_input[key]), INPUT_PRECISION)] for key in sorted(load_input)]
+    return json.dumps([kind, None if height is None else round(float(height), INPUT_PRECISION), inputs])
+
+def load_cache(cache_path):
+    """Loads cache file. Broken, missing or outdated cache is replaced with an empty cache.
+
+    Args:
+        cache_path (str): Path to the cache file.
+
+    Returns:
+        dict: Cache with version, hit and miss counts and results in least recently used order.
+    """
+
+    empty = {"version": CACHE_VERSION, "hits": 0, "misses": 0, "results": OrderedDict()}
+    if not os.path.exists(cache_path):
+        return empty
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        if cache["version"] != CACHE_VERSION:
+            return empty
+        cache["results"] = OrderedDict(cache["results"])
+        cache["hits"], cache["misses"] = int(cache["hits"]), int(cache["misses"])
+    except (IOError, ValueError, KeyError, TypeError):
+        return empty
+
+    return cache
+
+def save_cache(cache_path, cache, cache_size=CACHE_SIZE):
+    """Saves cache file. Least recently used results over the cache size are dropped."""
+
+    results = cache["results"]
+    while len(results) > cache_size:
+        results.popitem(last=False)
+
+    data = dict(cache)
+    data["results"] = list(results.items())
+    try:
+        with open(cache_path, "w") as f:
+            json.dump(data, f)
+    except IOError:
+        pass # Cache is only an optimization, calculation results are still returned
+
+def get_cached_results(cache, keys, calculate_missing):
+    """Returns results of the keys from the cache. Missing results are calculated together
+    and stored into the cache. Used results are moved to the end of the least recently used order.
+
+    Args:
+        cache (dict): Cache from load_cache.
+        keys (list): List of cache keys.
+        calculate_missing (function): Function which takes list of missing keys and returns dictionary of key and result.
+
+    Returns:
+        dict: Dictionary where key is cache key and value is result.
+
+    Raises:
+        ValueError: If calculate_missing does not return result for every missing key.
+    """
+
+    results = cache["results"]
+    missing = [key for key in keys if key not in results]
+    calculated = calculate_missing(missing) if missing else {}
+    not_calculated = [key for key in missing if key not in calculated]
+    if not_calculated:
+        raise ValueError("Load calculation did not return results for {} cache keys: {}".format(len(not_calculated), ", ".join(not_calculated[:3])))
+    cache["hits"] += len(keys) - len(missing)
+    cache["misses"] += len(missing)
+
+    found = {}
+    for key in keys:
+        found[key] = calculated[key] if key in calculated else results.pop(key)
+        results[key] = found[key]
+
+    return found
+
+def get_load_information(cache, load_input):
+    """Returns formatted project-wide load parameters from the cache or calculates them.
+
+    Returns:
+        dict: A dictionary containing parameter name as key and formated parameter value as value.
+    """
+
+    key = create_cache_key(load_input)
+    return dict(get_cached_results(cache, [key], lambda keys: {key: calculate_load_information(load_input)})[key])
+
+def get_height_load_information(cache, load_input, kind, heights, calculate):
+    """Returns load parameters of each unique height from the cache. Heights which are not cached
+    are calculated together with a single call of the calculation function.
+
+    Args:
+        cache (dict): Cache from load_cache.
+        load_input (dict): Input values of the load input form (A1 - C4).
+        kind (str): Level or Element. Separates the results of the calculation functions in the cache.
+        heights (list): Heights in meters. Same height can occur multiple times.
+        calculate (function): Function which takes load input and dictionary of id and height and returns dictionary of id and parameters.
+
+    Returns:
+        dict: Dictionary where key is height and value is dictionary of parameter name and formatted value.
+    """
+
+    keys = {height: create_cache_key(load_input, kind, height) for height in set(heights)}
+
+    def calculate_missing(missing_keys):
+        missing_keys = set(missing_keys)
+        missing_heights = [height for height, key in keys.items() if key in missing_keys]
+        params = calculate(load_input, {height: height for height in missing_heights})
+        return {keys[height]: params[height] for height in missing_heights}
+
+    results = get_cached_results(cache, list(keys.values()), calculate_missing)
+    return {height: results[key] for height, key in keys.items()}
+
+def get_level_load_information(cache, load_input, level_heights):
+    """Returns level load parameters (see calculate_level_load_information). Each level height is cached separately.
+
+    Returns:
+        dict: Dictionary where key is level id and value is dictionary of parameter name and formatted value.
+    """
+
+    params = get_height_load_information(cache, load_input, "Level", level_heights.values(), calculate_level_load_information)
+    return {level_id: dict(params[height]) for level_id, height in level_heights.items()}
+
+def get_element_load_information(cache, load_input, element_heights, bucket=ELEVATION_BUCKET):
+    """Returns element load parameters (see calculate_element_load_information). Each height bucket is
+    cached separately and elements in the same bucket share the same parameter values.
+
+    Returns:
+        dict: Dictionary where key is element id and value is dictionary of parameter name and formatted value.
+    """
+
+    element_buckets = {element_id: bucket_height(height, bucket) for element_id, height in element_heights.items()}
+    calculate = lambda load_input, heights: calculate_element_load_information(load_input, heights, bucket)
+    params = get_height_load_information(cache, load_input, "Element", element_buckets.values(), calculate)
+    return {element_id: params[height] for element_id, height in element_buckets.items()}
+
+def format_cache_statistics(cache):
+    """Formats hit and miss counts of the cache.
+
+    Args:
+        cache (dict): Cache from load_cache.
+
+    Returns:
+        str: Hits, misses, hit rate and number of stored results.
+    """
+
+    hits, misses = cache["hits"], cache["misses"]
+    total = hits + misses
+    hit_rate = 100.0 * hits / total if total else 0.0
+    return "{0} hits, {1} misses ({2:.0f} % hit rate), {3} stored results".format(hits, misses, hit_rate, len(cache["results"]))
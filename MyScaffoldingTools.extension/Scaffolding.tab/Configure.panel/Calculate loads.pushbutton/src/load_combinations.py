@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Load combinations according to EN 1990 with the K factor (KFI) of the consequence class and
+the combination factor of the imposed load (EN 12811-1). Combinations are evaluated column-wise:
+each load case is a list of values over all elements (ie. legs), and the governing combination of
+every element is found with map/zip, so there is no Python-level loop over the elements.
+"""
+
+import operator
+from collections import namedtuple
+from itertools import repeat
+
+from src.calculate_load_Information import calculate_k_factor, calculate_imposed_load_combination_factor
+
+PERMANENT_LOAD = "Self-weight"
+VARIABLE_LOADS = ["Imposed load", "Snow load", "Wind load"]
+UPLIFT_LOAD = "Wind suction"
+SNOW_COMBINATION_FACTOR = 0.7
+WIND_COMBINATION_FACTOR = 0.6
+PERMANENT_FACTOR = 1.35 # EN 1990 (6.10a)
+REDUCED_PERMANENT_FACTOR = 1.15 # EN 1990 (6.10b)
+FAVOURABLE_PERMANENT_FACTOR = 0.9
+VARIABLE_FACTOR = 1.5
+ULS = "ULS"
+SLS = "SLS"
+
+# Factors is a dictionary where key is load case and value is the factor of the load case
+Combination = namedtuple("Combination", ["name", "limit_state", "factors"])
+
+def get_combination_factors(imposed_load):
+    return {
+        "Imposed load": calculate_imposed_load_combination_factor(imposed_load),
+        "Snow load": SNOW_COMBINATION_FACTOR,
+        "Wind load": WIND_COMBINATION_FACTOR
+    }
+
+def generate_load_combinations(imposed_load, consequence_class):
+    """Generates ULS (EN 1990 6.10a and 6.10b) and characteristic SLS combinations. Each variable
+    load is the leading load in turn and the other variable loads are reduced by their combination
+    factors. Uplift combination has favourable self-weight and wind suction only, since favourable
+    variable loads are not taken into account.
+
+    Args:
+        imposed_load (float): Imposed load in kN/m2.
+        consequence_class (int): Consequence class (CC1, CC2, or CC3)
+
+    Returns:
+        list: List of Combination tuples.
+    """
+
+    k_factor = calculate_k_factor(consequence_class)
+    combination_factors = get_combination_factors(imposed_load)
+    variable_factor = k_factor * VARIABLE_FACTOR
+
+    combinations = [
+        Combination("ULS 6.10a", ULS, dict(
+            [(PERMANENT_LOAD, k_factor * PERMANENT_FACTOR)] +
+            [(load, variable_factor * combination_factors[load]) for load in VARIABLE_LOADS]
+        ))
+    ]
+
+    for leading_load in VARIABLE_LOADS:
+        accompanying = [(load, combination_factors[load]) for load in VARIABLE_LOADS if load != leading_load]
+        combinations.append(Combination("ULS 6.10b {}".format(leading_load), ULS, dict(
+            [(PERMANENT_LOAD, k_factor * REDUCED_PERMANENT_FACTOR), (leading_load, variable_factor)] +
+            [(load, variable_factor * factor) for load, factor in accompanying]
+        )))
+        combinations.append(Combination("SLS {}".format(leading_load), SLS, dict(
+            [(PERMANENT_LOAD, 1.0), (leading_load, 1.0)] + accompanying
+        )))
+
+    combinations.append(Combination("ULS uplift", ULS, {
+        PERMANENT_LOAD: FAVOURABLE_PERMANENT_FACTOR,
+        UPLIFT_LOAD: variable_factor
+    }))
+
+    return combinations
+
+def evaluate_combination(load_columns, combination):
+    """Evaluates a single combination over all elements.
+
+    Args:
+        load_columns (dict): Dictionary where key is load case and value is list of loads of the elements.
+        combination (Combination): Load combination.
+
+    Returns:
+        list: Combined load of each element.
+    """
+
+    length = len(next(iter(load_columns.values()), []))
+    combined = [0.0] * length
+    for load, factor in combination.factors.items():
+        if factor and load in load_columns:
+            combined = list(map(operator.add, combined, map(operator.mul, load_columns[load], repeat(factor))))
+    return combined
+
+def find_governing_combinations(load_columns, combinations, limit_state=ULS):
+    """Finds the governing combination of each element. Governing combination has the largest absolute value.
+
+    Args:
+        load_columns (dict): Dictionary where key is load case and value is list of loads of the elements.
+        combinations (list): List of Combination tuples.
+        limit_state (str, optional): ULS or SLS. Defaults to ULS.
+
+    Returns:
+        list: List of tuples of combined load and name of the governing combination in the same order than the elements.
+    """
+
+    selected = [combination for combination in combinations if combination.limit_state == limit_state]
+    if not selected or not load_columns:
+        return []
+
+    candidates = []
+    for index, combination in enumerate(selected):
+        values = evaluate_combination(load_columns, combination)
+        candidates.append(list(zip(map(abs, values), values, repeat(index))))
+
+    names = [combination.name for combination in selected]
+    return [(value, names[index]) for _, value, index in map(max, zip(*candidates))]
@@ -7,6 +7,7 @@ clr.AddReference("System.Drawing")
 from System.Windows.Forms import Form, Label, TextBox, Button, DialogResult, MessageBox, RadioButton, GroupBox, Screen
 from System.Drawing import Point, Size
 from parameters import get_language, get_project_load_params
+from src.calculate_load_Information import INPUT_CHOICES
 
 def set_default_value(load_params, param_name, default_value):
     value = load_params.get(param_name, default_value)
@@ -155,13 +156,7 @@ def show_input_form():
         return None
 
 def convert_radio_button_values(key, input_str):
-        mapping = {
-            "A1": {"FIN": 1, "ENG": 2, "SWE": 3},
-            "A4": {"CC1": 1, "CC2": 2, "CC3": 3},
-            "B2": {"0": 0, "I": 1, "II": 2, "III": 3, "IV": 4}
-        }
-
-        return mapping[key][input_str]
+        return INPUT_CHOICES[key][input_str]
 
 def validate_text_input(key, input_str):
     input_str = input_str.replace(",", ".")
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Parameter sweep of the load calculation. Runs calculate_load_values over the Cartesian product
+of input ranges and returns the results as a table of numbers. Formatting is done only when the
+table is written into csv or xlsx file.
+
+Example:
+    headers, rows = sweep_load_calculations(base_input, [("Terrain category", [0, 1, 2]), ("Height above ground", [10, 20, 30])])
+    write_sweep("sweep.xlsx", headers, rows)
+"""
+
+import csv
+import itertools
+import os
+import xlsxwriter
+
+from src.calculate_load_Information import calculate_load_values, PRESSURE_SURFACES
+
+# Inputs by the load parameter name and the key of the load input form
+INPUT_KEYS = {
+    "National Annex": "A1",
+    "Imposed loads": "A2",
+    "Snow load": "A3",
+    "Consequence class": "A4",
+    "Fundamental basic wind velocity": "B1",
+    "Terrain category": "B2",
+    "Return period": "B3",
+    "Seasonal factor": "B4",
+    "Orography factor": "B5",
+    "Height above ground": "C1",
+    "Roof width": "C2",
+    "Bay length": "C3",
+    "Roof angle": "C4"
+}
+# Inputs which do not affect the wind results or line loads of the sweep
+UNSWEPT_INPUTS = ["Imposed loads", "Snow load", "Consequence class"]
+WIND_RESULTS = ["Probability factor", "Basic wind velocity", "Roughness factor", "Peak velocity pressure", "Peak wind speed"]
+
+def get_sweep_headers(input_names):
+    return list(input_names) + WIND_RESULTS + ["{} load".format(surface) for surface in PRESSURE_SURFACES]
+
+def sweep_load_calculations(base_input, ranges):
+    """Calculates loads for every combination of the input ranges. Inputs which are not swept
+    are taken from the base input. Probability and terrain factors are memoised, so they are
+    calculated only once per return period and terrain category.
+
+    Args:
+        base_input (dict): Input values of the load input form (A1 - C4).
+        ranges (list): List of tuples of load parameter name (see INPUT_KEYS) and list of values.
+            Inputs of UNSWEPT_INPUTS are not accepted, since they would produce identical rows.
+
+    Returns:
+        tuple: List of headers and list of rows. Row contains swept input values followed by wind results and line loads (kN/m).
+    """
+
+    input_names = [name for name, _ in ranges]
+    unswept_names = [name for name in input_names if name in UNSWEPT_INPUTS]
+    if unswept_names:
+        raise ValueError("Sweep results do not depend on: {}".format(", ".join(unswept_names)))
+    input_keys = [INPUT_KEYS[name] for name in input_names]
+    rows = []
+    load_input = dict(base_input)
+
+    for values in itertools.product(*[values for _, values in ranges]):
+        load_input.update(zip(input_keys, values))
+        wind_calculation_params, pressure_coefficients, _ = calculate_load_values(load_input)
+        line_load = wind_calculation_params["Peak velocity pressure"] * load_input["C3"]
+
+        row = list(values)
+        row.extend(wind_calculation_params[name] for name in WIND_RESULTS)
+        row.extend(pressure_coefficients[surface] * line_load for surface in PRESSURE_SURFACES)
+        rows.append(row)
+
+    return get_sweep_headers(input_names), rows
+
+def write_sweep_csv(file_path, headers, rows):
+    with open(file_path, "w") as f:
+        writer = csv.writer(f, delimiter=";", lineterminator="\n")
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(["{:.3f}".format(value).replace(".", ",") if isinstance(value, float) else value for value in row])
+
+def write_sweep_xlsx(file_path, headers, rows):
+    workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet("Sweep")
+    header_format = workbook.add_format({"bold": True})
+    number_format = workbook.add_format({"num_format": "0.000"})
+
+    worksheet.write_row(0, 0, headers, header_format)
+    for row_index, row in enumerate(rows, 1):
+        worksheet.write_row(row_index, 0, row, number_format)
+    worksheet.autofilter(0, 0, len(rows), len(headers) - 1)
+
+    workbook.close()
+
+def write_sweep(file_path, headers, rows):
+    """Writes sweep results into csv or xlsx file depending on the file extension.
+
+    Args:
+        file_path (str): Path to the output file (.csv or .xlsx).
+        headers (list): List of headers.
+        rows (list): List of result rows.
+    """
+
+    if os.path.splitext(file_path)[1].lower() == ".xlsx":
+        write_sweep_xlsx(file_path, headers, rows)
+    else:
+        write_sweep_csv(file_path, headers, rows)
@@ -1,17 +1,264 @@
 # -*- coding: utf-8 -*-
 
 from pyrevit import revit, DB
+from parameters import get_shared_parameter_guids, collect_shared_parameter_hosts
+from products import collect_generic_models
+from src.calculate_load_Information import ELEMENT_LOAD_PARAMS
+from src.anchor_forces import Anchor, ANCHOR_CAPACITY_PARAM
+from src.leg_loads import BasePlate, Component, BASE_PLATE_PARAM, get_facade_angle
 
-def update_load_parameters(load_params):
-    collector = DB.FilteredElementCollector(revit.doc).WhereElementIsNotElementType().ToElements()
+def find_load_parameter_changes(load_params, element_params=None):
+    """Finds load parameters whose value differs from the calculated value. Shared parameter
+    GUIDs are resolved once and only elements which have the load parameters
+    (ie. project information, title blocks and load information annotations) are visited.
+
+    Args:
+        load_params (dict): Dictionary where key is parameter name and value is formatted parameter value.
+        element_params (dict, optional): Dictionary where key is element id and value is dictionary of element's own parameter values. Own values are not overwritten. Defaults to None.
+
+    Returns:
+        list: List of tuples of parameter and new value.
+    """
+
+    param_guids = get_shared_parameter_guids(list(load_params.keys()))
+    if not param_guids:
+        return []
+
+    changes = []
+    element_params = element_params or {}
+    for element in collect_shared_parameter_hosts(list(param_guids.keys())):
+        own_params = element_params.get(element.Id)
+        if own_params:
+            element_param_guids = {name: guids for name, guids in param_guids.items() if name not in own_params}
+            changes.extend(find_element_parameter_changes(element, element_param_guids, load_params))
+        else:
+            changes.extend(find_element_parameter_changes(element, param_guids, load_params))
+
+    return changes
+
+def find_element_parameter_changes(element, param_guids, params):
+    changes = []
+    for param_name, guids in param_guids.items():
+        new_value = params[param_name]
+        for guid in guids:
+            param = element.get_Parameter(guid)
+            if param and not param.IsReadOnly and param.StorageType == DB.StorageType.String and param.AsString() != new_value:
+                changes.append((param, new_value))
+
+    return changes
+
+def get_level_heights():
+    """Finds elevations of the levels which are above the ground. Project elevation zero is used as the ground level.
+
+    Returns:
+        dict: Dictionary where key is level id and value is level height from the ground in meters.
+    """
+
+    level_heights = {}
+    for level in DB.FilteredElementCollector(revit.doc).OfClass(DB.Level):
+        height = DB.UnitUtils.ConvertFromInternalUnits(level.Elevation, DB.UnitTypeId.Meters)
+        if height >= 0:
+            level_heights[level.Id] = height
+
+    return level_heights
+
+def collect_load_elements():
+    """Collects scaffolding components (generic models) which have per-element load parameters.
+
+    Returns:
+        Autodesk.Revit.DB.FilteredElementCollector: Elements with the load parameters.
+    """
+
+    return collect_shared_parameter_hosts(ELEMENT_LOAD_PARAMS, DB.BuiltInCategory.OST_GenericModel)
+
+def get_element_heights(elements):
+    """Finds height of each element from its bounding box top or its location point. Project
+    elevation zero is used as the ground level and elements below it are set to the ground.
+
+    Args:
+        elements (list): List of Autodesk.Revit.DB Element classes.
+
+    Returns:
+        dict: Dictionary where key is element id and value is element height from the ground in meters.
+    """
+
+    element_heights = {}
+    for element in elements:
+        bounding_box = element.get_BoundingBox(None)
+        if bounding_box:
+            elevation = bounding_box.Max.Z
+        elif isinstance(element.Location, DB.LocationPoint):
+            elevation = element.Location.Point.Z
+        else:
+            continue
+        element_heights[element.Id] = max(DB.UnitUtils.ConvertFromInternalUnits(elevation, DB.UnitTypeId.Meters), 0.0)
+
+    return element_heights
+
+def get_element_point(element):
+    if isinstance(element.Location, DB.LocationPoint):
+        return element.Location.Point
+    bounding_box = element.get_BoundingBox(None)
+    if bounding_box:
+        return (bounding_box.Min + bounding_box.Max) / 2.0
+    return None
+
+def get_anchor_capacity(param):
+    """Reads anchor capacity in kilonewtons from the anchor family parameter.
+
+    Args:
+        param: Autodesk.Revit.DB.Parameter class.
+
+    Returns:
+        float: Anchor capacity in kN. None if the parameter has no numeric value.
+    """
+
+    if param.StorageType == DB.StorageType.Double:
+        value = param.AsDouble()
+        if param.Definition.GetDataType() == DB.SpecTypeId.Force:
+            value = DB.UnitUtils.ConvertFromInternalUnits(value, DB.UnitTypeId.Kilonewtons)
+        return value or None
+
+    if param.StorageType == DB.StorageType.String:
+        try:
+            return float((param.AsString() or "").replace(",", ".")) or None
+        except ValueError:
+            return None
+
+    return None
+
+def collect_anchors():
+    """Collects anchoring components (generic models with Max X+ parameter). Facade of the anchor is
+    identified by its facing orientation and distance of the facade plane from the origin.
+
+    Returns:
+        tuple: List of Anchor tuples and dictionary where key is element id and value is anchor capacity in kN.
+    """
+
+    anchors = []
+    capacities = {}
+
+    for element in collect_generic_models():
+        capacity_param = element.LookupParameter(ANCHOR_CAPACITY_PARAM)
+        point = get_element_point(element) if capacity_param else None
+        if point is None:
+            continue
+
+        facing = element.FacingOrientation
+        x, y, z = [DB.UnitUtils.ConvertFromInternalUnits(value, DB.UnitTypeId.Meters) for value in (point.X, point.Y, point.Z)]
+        facade = (round(facing.X, 2), round(facing.Y, 2), round(x * facing.X + y * facing.Y, 1))
+        anchors.append(Anchor(element.Id, facade, x * -facing.Y + y * facing.X, max(z, 0.0)))
+        capacities[element.Id] = get_anchor_capacity(capacity_param)
+
+    return anchors, capacities
+
+def get_parameter_number(param):
+    if param is None or not param.HasValue:
+        return 0.0
+    if param.StorageType == DB.StorageType.Double:
+        return param.AsDouble()
+    if param.StorageType == DB.StorageType.String:
+        try:
+            return float((param.AsString() or "").replace(",", "."))
+        except ValueError:
+            return 0.0
+    return 0.0
+
+def get_component_weight(element, weight_cache):
+    """Reads component weight in kilograms from the instance or type parameter named as Weight.
+    Type weights are cached by the type id."""
+
+    instance_param = element.LookupParameter("Weight")
+    if instance_param:
+        return get_parameter_number(instance_param)
+
+    type_id = element.GetTypeId()
+    if type_id not in weight_cache:
+        element_type = revit.doc.GetElement(type_id)
+        weight_cache[type_id] = get_parameter_number(element_type.LookupParameter("Weight") if element_type else None)
+    return weight_cache[type_id]
+
+def collect_leg_components():
+    """Collects base plates (generic models with Max Z+ parameter) and weighted scaffolding components
+    with their plan bounding boxes.
+
+    Returns:
+        tuple: List of BasePlate tuples and list of Component tuples.
+    """
+
+    plates = []
+    components = []
+    weight_cache = {}
+
+    def to_meters(value):
+        return DB.UnitUtils.ConvertFromInternalUnits(value, DB.UnitTypeId.Meters)
+
+    for element in collect_generic_models():
+        if element.LookupParameter(BASE_PLATE_PARAM):
+            point = get_element_point(element)
+            if point:
+                facing = element.FacingOrientation
+                plates.append(BasePlate(element.Id, to_meters(point.X), to_meters(point.Y), get_facade_angle(facing.X, facing.Y)))
+            continue
+
+        weight = get_component_weight(element, weight_cache)
+        bounding_box = element.get_BoundingBox(None) if weight else None
+        if bounding_box:
+            components.append(Component(
+                to_meters(bounding_box.Min.X),
+                to_meters(bounding_box.Min.Y),
+                to_meters(bounding_box.Max.X),
+                to_meters(bounding_box.Max.Y),
+                weight
+            ))
+
+    return plates, components
+
+def find_element_params_changes(element_params):
+    """Finds per-element load parameters (ie. levels and scaffolding components) whose value differs from the calculated value.
+
+    Args:
+        element_params (dict): Dictionary where key is element id and value is dictionary of parameter name and formatted value.
+
+    Returns:
+        list: List of tuples of parameter and new value.
+    """
+
+    param_names = set(name for params in element_params.values() for name in params)
+    param_guids = get_shared_parameter_guids(list(param_names))
+    if not param_guids:
+        return []
+
+    changes = []
+    for element_id, params in element_params.items():
+        element_param_guids = {name: guids for name, guids in param_guids.items() if name in params}
+        changes.extend(find_element_parameter_changes(revit.doc.GetElement(element_id), element_param_guids, params))
+
+    return changes
+
+def update_load_parameters(load_params, element_params=None):
+    """Writes project load parameters and per-element load parameters in one transaction.
+    Own values of the elements are not overwritten by the project wide values.
+
+    Args:
+        load_params (dict): Dictionary where key is parameter name and value is formatted parameter value.
+        element_params (dict, optional): Dictionary where key is element id and value is dictionary of parameter name and formatted value. Defaults to None.
+
+    Returns:
+        int: Number of changed parameters.
+    """
+
+    element_params = element_params or {}
+    changes = find_load_parameter_changes(load_params, element_params)
+    if element_params:
+        changes.extend(find_element_params_changes(element_params))
+    if not changes:
+        return 0
 
     with DB.Transaction(revit.doc, "Update load parameters") as t:
         t.Start()
-        for element in collector:
-            for param in element.Parameters:
-                if param.IsShared and param.StorageType == DB.StorageType.String:
-                    param_name = param.Definition.Name
-                    if param_name in load_params.keys():
-                        new_value = load_params[param_name]
-                        param.Set(new_value)
-        t.Commit()
\ No newline at end of file
+        for param, new_value in changes:
+            param.Set(new_value)
+        t.Commit()
+
+    return len(changes)
@@ -1,17 +1,36 @@
 import os
 
-from src.information_service import (
-    get_project_language,
-    get_project_parameters,
-    get_additional_notes, 
-    get_headers,
-    get_schedule_information,
-    format_output_filename
-)
-from src.file_service import get_master_data, write_to_xlsx
-from src.material_list import create_material_list
+from src.information_service import get_project_language, format_output_filenames
+from src.export_task import create_export_snapshot, run_export
+from src.model_quantities import PHASE, ZONE
+from src.material_list import LANGUAGES
 from outputter import Outputter
+from pyrevit import forms
 
+PARTITION_OPTIONS = {"Project": None, "By phase": PHASE, "By zone": ZONE}
+ALL_LANGUAGES = "All languages"
+
+def select_export_options():
+    """Asks how the material list is partitioned and whether it is exported in all languages
+    when the button is shift-clicked.
+
+    Returns:
+        tuple: PHASE, ZONE or None for a single project material list and boolean for all languages.
+    """
+
+    if not __shiftclick__:
+        return None, False
+
+    result = forms.CommandSwitchWindow.show(
+        sorted(PARTITION_OPTIONS),
+        switches=[ALL_LANGUAGES],
+        message="Material list export options"
+    )
+    if result is None: # Dialog was cancelled
+        return None, False
+
+    selected, switches = result
+    return PARTITION_OPTIONS.get(selected), bool(switches and switches.get(ALL_LANGUAGES))
 
 def main():
     outputter = Outputter()
@@ -21,27 +40,19 @@ def main():
         base_dir = os.path.dirname(os.path.abspath(__file__))
         master_file_path = os.path.join(base_dir, "assets", "master_material_list.csv")
 
-        output_file_name = format_output_filename(outputter, main_language)
+        partition_by, all_languages = select_export_options()
+        languages = [main_language] + [language for language in LANGUAGES if language != main_language] if all_languages else [main_language]
+        output_file_names = format_output_filenames(outputter, languages)
         output_dir_path = os.path.abspath(os.path.join(base_dir, "..", "..", "..", "..", "..", "outputs"))
 
         if not os.path.exists(output_dir_path):
             os.makedirs(output_dir_path)
             print("Can not find output folder for the material list. Folder has been created and file will be stored into {}".format(output_dir_path))
 
-        output_file_path = os.path.join(output_dir_path, output_file_name)
-
-        master_data = get_master_data(master_file_path)
-        schedule_data = get_schedule_information("Material list")
-        material_list, notes, totals = create_material_list(outputter, schedule_data, master_data, main_language)
-
-        project_params = get_project_parameters(outputter, main_language, total_weight=totals[0], total_price=totals[1])
-        project_notes = get_additional_notes(main_language, notes)
-        headers = get_headers(main_language)
+        outputs = [(language, os.path.join(output_dir_path, output_file_name)) for language, output_file_name in zip(languages, output_file_names)]
 
-        if len(material_list) > 0:
-            write_to_xlsx(project_params, project_notes, headers, material_list, output_file_path, outputter)
-        else:
-            outputter.print_response("Export cancelled", "Verify that schedule is correctly named and project contains scaffolding material.", "red")
+        snapshot = create_export_snapshot(outputter, outputs, master_file_path, partition_by)
+        run_export(snapshot, outputter)
 
 if __name__ == "__main__":
     main()
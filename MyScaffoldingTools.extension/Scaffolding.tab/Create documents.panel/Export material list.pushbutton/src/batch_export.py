@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Headless batch export of material lists without Revit.
+
+Reads a directory of exported "Material list" schedule csv files and writes a material list
+Excel file for each of them. Project metadata is read from a json file with the same name than
+the csv file (ie. Project_Phase1.csv and Project_Phase1.json), for example:
+
+    {"language": "FIN", "Author": "Designer", "Client Name": "Client", "Project Address": "Address",
+     "Project Name": "Project", "Supervisor name": "Supervisor"}
+
+Master material list is parsed once and shared with the worker processes. If the output directory
+contains a previous export, changes are written into an extra worksheet. With --all-languages the
+material list is aggregated once and written in every language.
+
+Usage:
+    python "src/batch_export.py" SCHEDULE_DIR MASTER_CSV OUTPUT_DIR [--processes N] [--all-languages]
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from multiprocessing import Pool, cpu_count
+
+BUTTON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB_DIR = os.path.abspath(os.path.join(BUTTON_DIR, "..", "..", "..", "lib"))
+for path in (LIB_DIR, BUTTON_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from parameters import INFO_PARAMS
+from src.file_service import get_master_data, write_to_xlsx, open_csv
+from src.information_service import get_project_parameters, get_additional_notes, get_headers, format_material_list_filename
+from src.material_list import aggregate_material_list, localize_material_list, LANGUAGES
+from src.delta_service import (
+    create_material_snapshot,
+    load_material_snapshot,
+    save_material_snapshot,
+    compare_material_snapshots,
+    get_change_headers,
+    get_changes_name
+)
+
+SCHEDULE_HEADER = "Count"
+DEFAULT_LANGUAGE = "ENG"
+
+worker_master_data = None
+
+class ConsoleOutputter(object):
+    """Prints the same messages than Outputter into the console. HTML tags are removed."""
+
+    def __init__(self, name=""):
+        self.name = name
+
+    def print_response(self, check_name, response, color="black"):
+        prefix = "[{}] ".format(self.name) if self.name else ""
+        print("{0}{1}: {2}".format(prefix, check_name, re.sub(r"<[^>]+>", "", response)))
+
+def read_schedule_csv(file_path):
+    """Reads exported material list schedule. Delimiter is detected from the file content.
+    Title rows before the header row (first cell is Count) are skipped.
+
+    Args:
+        file_path (str): Path to the schedule csv file.
+
+    Returns:
+        list: List of rows where the first row contains headers.
+    """
+
+    with open_csv(file_path) as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        rows = [row for row in csv.reader(f, dialect) if any(cell.strip() for cell in row)]
+
+    for index, row in enumerate(rows):
+        if row and row[0].strip() == SCHEDULE_HEADER:
+            return rows[index:]
+
+    return rows
+
+def read_project_metadata(file_path):
+    """Reads project metadata json file. Missing file returns empty metadata.
+
+    Args:
+        file_path (str): Path to the json file.
+
+    Returns:
+        dict: Project metadata.
+    """
+
+    if not os.path.exists(file_path):
+        return {}
+
+    with open(file_path) as f:
+        return json.load(f)
+
+def init_worker(master_data):
+    global worker_master_data
+    worker_master_data = master_data
+
+def write_project_language(outputter, project_filename, output_dir, language, aggregated, information_params):
+    """Writes aggregated material list of a single project into Excel file in the given language.
+
+    Returns:
+        str: Path to the output file. None if the output file is open.
+    """
+
+    rows, raw_notes, totals = aggregated
+    material_list, notes = localize_material_list(rows, raw_notes, language)
+    project_params = get_project_parameters(outputter, language, total_weight=totals[0], total_price=totals[1], information_params=information_params)
+    project_notes = get_additional_notes(language, notes)
+    headers = get_headers(language)
+
+    output_path = os.path.join(output_dir, format_material_list_filename(project_filename, language))
+    material_snapshot = create_material_snapshot(material_list)
+    previous_snapshot = load_material_snapshot(output_path)
+    changes = None if previous_snapshot is None else compare_material_snapshots(previous_snapshot, material_snapshot, language)
+
+    if not write_to_xlsx(
+        project_params,
+        project_notes,
+        headers,
+        material_list,
+        output_path,
+        outputter,
+        open_file=False,
+        changes=changes,
+        change_headers=get_change_headers(language),
+        changes_name=get_changes_name(language)
+    ):
+        return None
+
+    save_material_snapshot(output_path, material_snapshot)
+
+    return output_path
+
+def export_project(task):
+    """Creates material list Excel files from a single schedule csv file. Material list is aggregated
+    once and written in the project language or in all languages.
+
+    Args:
+        task (tuple): Path to the schedule csv file, output directory and boolean for all languages.
+
+    Returns:
+        tuple: Path to the schedule csv file, list of output file paths and error message (None if succeeded).
+    """
+
+    schedule_path, output_dir, all_languages = task
+    base_path = os.path.splitext(schedule_path)[0]
+    project_filename = os.path.basename(base_path)
+    outputter = ConsoleOutputter(project_filename)
+
+    try:
+        metadata = read_project_metadata(base_path + ".json")
+        language = metadata.get("language", DEFAULT_LANGUAGE)
+        languages = [language] + [other for other in LANGUAGES if other != language] if all_languages else [language]
+        information_params = {key: metadata[key] for key in INFO_PARAMS if key in metadata}
+
+        schedule_data = read_schedule_csv(schedule_path)
+        aggregated = aggregate_material_list(schedule_data, worker_master_data, outputter)
+
+        if len(aggregated[0]) == 0:
+            return schedule_path, [], "Schedule does not contain scaffolding material."
+
+        output_paths = []
+        for output_language in languages:
+            output_path = write_project_language(
+                outputter,
+                metadata.get("filename", project_filename),
+                output_dir,
+                output_language,
+                aggregated,
+                information_params
+            )
+            if output_path is None:
+                return schedule_path, output_paths, "Output file is open."
+            output_paths.append(output_path)
+
+        return schedule_path, output_paths, None
+    except Exception as error:
+        return schedule_path, [], str(error)
+
+def batch_export(schedule_dir, master_file_path, output_dir, processes=None, all_languages=False):
+    """Exports material lists for all schedule csv files of the directory using a process pool.
+
+    Args:
+        schedule_dir (str): Directory of the exported schedule csv files.
+        master_file_path (str): Path to the master material list csv file.
+        output_dir (str): Directory for the Excel files.
+        processes (int, optional): Number of worker processes. Defaults to None, which uses number of CPUs.
+        all_languages (bool, optional): Writes material lists in all languages. Defaults to False.
+
+    Returns:
+        list: List of tuples of schedule path, list of output paths and error message.
+    """
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    master_data = get_master_data(master_file_path, ConsoleOutputter())
+    schedule_paths = sorted(
+        os.path.join(schedule_dir, filename)
+        for filename in os.listdir(schedule_dir)
+        if filename.lower().endswith(".csv")
+    )
+    tasks = [(schedule_path, output_dir, all_languages) for schedule_path in schedule_paths]
+
+    pool = Pool(processes or cpu_count(), initializer=init_worker, initargs=(master_data,))
+    try:
+        results = list(pool.imap_unordered(export_project, tasks))
+    finally:
+        pool.close()
+        pool.join()
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Export material lists from schedule csv files without Revit.")
+    parser.add_argument("schedule_dir", help="Directory of exported Material list schedule csv files.")
+    parser.add_argument("master_csv", help="Master material list csv file.")
+    parser.add_argument("output_dir", help="Directory for the material list Excel files.")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes. Defaults to number of CPUs.")
+    parser.add_argument("--all-languages", action="store_true", help="Write material lists in all languages instead of the project language.")
+    args = parser.parse_args()
+
+    results = batch_export(args.schedule_dir, args.master_csv, args.output_dir, args.processes, args.all_languages)
+    failed = [result for result in results if result[2]]
+
+    for schedule_path, output_paths, error in sorted(results):
+        if error:
+            print("FAILED {0}: {1}".format(schedule_path, error))
+        else:
+            print("OK {0} -> {1}".format(schedule_path, ", ".join(output_paths)))
+
+    print("Exported {0} of {1} material lists.".format(len(results) - len(failed), len(results)))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
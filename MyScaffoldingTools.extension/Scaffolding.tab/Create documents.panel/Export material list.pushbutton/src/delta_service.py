@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from translations import TRANSLATIONS
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+CHANGE_HEADERS = ["Status", "Product number", "Product name", "Previous count", "Count", "Count change", "Weight change", "Price change"]
+
+def get_snapshot_path(file_path):
+    return os.path.splitext(file_path)[0] + SNAPSHOT_SUFFIX
+
+def create_material_snapshot(material_list):
+    """Creates compact snapshot of the material list keyed by product number. Rows with the same
+    product number (ie. custom sized tarpaulins) are combined and their total weight and price are summed.
+
+    Sorted material row order:
+    0: product number
+    1: name in main language
+    2: count
+    3: weight
+    4: price
+
+    Args:
+        material_list (list): List of sorted material rows.
+
+    Returns:
+        dict: Dictionary where key is product number and value is dictionary of name, count, weight and price.
+    """
+
+    snapshot = {}
+    for row in material_list:
+        product_number, name, count, weight, price = row[:5]
+        product = snapshot.setdefault(product_number, {"name": name, "count": 0, "weight": 0.00, "price": 0.00})
+        product["count"] += count
+        product["weight"] += count * (weight or 0.00) # Weight of some safety wire sets may be unknown
+        product["price"] += count * price
+
+    return snapshot
+
+def load_material_snapshot(file_path):
+    """Loads snapshot saved next to the previous export. Broken or missing snapshot is ignored.
+
+    Args:
+        file_path (str): Path to the exported Excel file.
+
+    Returns:
+        dict: Material snapshot. None if previous snapshot is not available.
+    """
+
+    snapshot_path = get_snapshot_path(file_path)
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+def save_material_snapshot(file_path, snapshot):
+    with open(get_snapshot_path(file_path), "w") as f:
+        json.dump(snapshot, f, sort_keys=True)
+
+def compare_material_snapshots(previous, current, language="ENG"):
+    """Compares two material snapshots by product number. Only added, removed and changed
+    products are returned, so the result grows with the number of changes.
+
+    Args:
+        previous (dict): Snapshot of the previous export.
+        current (dict): Snapshot of the current export.
+        language (str, optional): Language selection. Defaults to "ENG".
+
+    Returns:
+        list: List of rows with status, product number, name, previous count, count, count change, weight change and price change.
+    """
+
+    empty = {"name": "", "count": 0, "weight": 0.00, "price": 0.00}
+    changes = []
+
+    for product_number in sorted(set(previous) | set(current)):
+        old = previous.get(product_number, empty)
+        new = current.get(product_number, empty)
+
+        if product_number not in previous:
+            status = "Added"
+        elif product_number not in current:
+            status = "Removed"
+        elif old["count"] != new["count"] or round(old["weight"] - new["weight"], 2) or round(old["price"] - new["price"], 2):
+            status = "Changed"
+        else:
+            continue
+
+        changes.append([
+            TRANSLATIONS[status].get(language, status),
+            product_number,
+            new["name"] or old["name"],
+            old["count"],
+            new["count"],
+            new["count"] - old["count"],
+            new["weight"] - old["weight"],
+            new["price"] - old["price"]
+        ])
+
+    return changes
+
+def get_change_headers(language="ENG"):
+    return [TRANSLATIONS[key].get(language, key) for key in CHANGE_HEADERS]
+
+def get_changes_name(language="ENG"):
+    return TRANSLATIONS["Changes"].get(language, "Changes")
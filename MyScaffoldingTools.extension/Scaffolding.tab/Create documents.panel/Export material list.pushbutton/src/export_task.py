@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+from parameters import get_project_information_params
+from src.information_service import get_project_parameters, get_additional_notes, get_headers
+from src.model_quantities import get_model_quantities, get_partitioned_model_quantities
+from src.file_service import get_master_data, write_to_xlsx
+from src.material_list import aggregate_material_list, localize_material_list
+from src.delta_service import (
+    create_material_snapshot,
+    load_material_snapshot,
+    save_material_snapshot,
+    compare_material_snapshots,
+    get_change_headers,
+    get_changes_name
+)
+
+ExportSnapshot = namedtuple("ExportSnapshot", ["outputs", "master_data", "schedule_data", "information_params", "partitions"])
+
+def freeze_rows(rows):
+    return tuple(tuple(row) for row in rows)
+
+def create_export_snapshot(outputter, outputs, master_file_path, partition_by=None):
+    """Reads everything needed for the export from the Revit project, so writing the export does
+    not use Revit API. Schedule rows are stored as tuples to keep the snapshot immutable.
+
+    Args:
+        outputter: Outputter class to print messages.
+        outputs (list): List of tuples of language and path to the exported Excel file.
+        master_file_path (str): Path to the master material list csv file.
+        partition_by (str, optional): PHASE or name of the zone parameter to create separate material lists. Defaults to None.
+
+    Returns:
+        ExportSnapshot: Snapshot of the project data.
+    """
+
+    partitions = None
+    if partition_by:
+        schedule_data, partition_data = get_partitioned_model_quantities(partition_by)
+        partitions = tuple((name, freeze_rows(partition_data[name])) for name in sorted(partition_data))
+    else:
+        schedule_data = get_model_quantities()
+
+    return ExportSnapshot(
+        tuple(outputs),
+        get_master_data(master_file_path, outputter),
+        freeze_rows(schedule_data),
+        dict(get_project_information_params()),
+        partitions
+    )
+
+def write_localized_export(outputter, language, output_file_path, aggregated, information_params, partitions=None):
+    """Writes aggregated material list into Excel file in the given language. If the material list
+    has been exported before, changes compared to the previous export are written into an extra
+    worksheet. Snapshot of the exported material list is saved next to the file.
+
+    Args:
+        outputter: Outputter class to print messages.
+        language (str): Language selection.
+        output_file_path (str): Path to the exported Excel file.
+        aggregated (tuple): Raw rows, raw notes and totals from aggregate_material_list.
+        information_params (dict): Project information parameters.
+        partitions (list, optional): List of tuples of partition name and raw rows. Defaults to None.
+    """
+
+    rows, raw_notes, totals = aggregated
+    material_list, notes = localize_material_list(rows, raw_notes, language)
+    partition_lists = None
+    if partitions:
+        partition_lists = [(name, localize_material_list(partition_rows, {}, language)[0]) for name, partition_rows in partitions]
+
+    project_params = get_project_parameters(outputter, language, total_weight=totals[0], total_price=totals[1], information_params=information_params)
+    project_notes = get_additional_notes(language, notes)
+    headers = get_headers(language)
+    material_snapshot = create_material_snapshot(material_list)
+    previous_snapshot = load_material_snapshot(output_file_path)
+    changes = None if previous_snapshot is None else compare_material_snapshots(previous_snapshot, material_snapshot, language)
+
+    exported = write_to_xlsx(
+        project_params,
+        project_notes,
+        headers,
+        material_list,
+        output_file_path,
+        outputter,
+        changes=changes,
+        change_headers=get_change_headers(language),
+        changes_name=get_changes_name(language),
+        partitions=partition_lists
+    )
+
+    if exported:
+        save_material_snapshot(output_file_path, material_snapshot)
+        outputter.print_response("Export finished", output_file_path)
+        if changes is not None:
+            outputter.print_response("Changes since previous export", "{} products changed.".format(len(changes)))
+
+def write_export(snapshot, outputter):
+    """Creates material list from the snapshot and writes it into Excel file for each output language.
+    Material list is aggregated only once and then localized for each language. Does not use Revit API,
+    so it only needs the snapshot. Progress is reported into the pyRevit output window.
+    Partitioned snapshot gets a worksheet for each partition in addition to the project totals.
+
+    Args:
+        snapshot (ExportSnapshot): Snapshot of the project data.
+        outputter: Outputter class to print messages.
+    """
+
+    steps = len(snapshot.outputs) + 1
+    outputter.update_progress(0, steps)
+
+    aggregated = aggregate_material_list(snapshot.schedule_data, snapshot.master_data, outputter)
+    partitions = None
+    if snapshot.partitions:
+        partitions = [
+            (name, aggregate_material_list(schedule_data, snapshot.master_data)[0])
+            for name, schedule_data in snapshot.partitions
+        ]
+    outputter.update_progress(1, steps)
+
+    if len(aggregated[0]) == 0:
+        outputter.print_response("Export cancelled", "Verify that project contains scaffolding material.", "red")
+        outputter.update_progress(steps, steps)
+        return
+
+    for step, (language, output_file_path) in enumerate(snapshot.outputs, 2):
+        write_localized_export(outputter, language, output_file_path, aggregated, snapshot.information_params, partitions)
+        outputter.update_progress(step, steps)
+
+def run_export(snapshot, outputter):
+    """Writes the export from the snapshot. Export runs on the script thread, since the output
+    window and the exported files are used until the end of the export. Errors are reported into
+    the pyRevit output window.
+
+    Args:
+        snapshot (ExportSnapshot): Snapshot of the project data.
+        outputter: Outputter class to print messages.
+    """
+
+    try:
+        write_export(snapshot, outputter)
+    except Exception as error:
+        outputter.print_response("Export failed", str(error), "red")
@@ -1,18 +1,202 @@
 import xlsxwriter
 import csv
 import os
+import re
+import hashlib
+import io
+import sys
+import tempfile
+try:
+    from pyrevit import script
+except ImportError: # Headless use outside of Revit
+    script = None
 from parameters import INFO_PARAMS
 
-def get_master_data(file_path):
-    with open(file_path, "rb") as f:
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+PRODUCT_NUMBER_INDEX = 0
+PRICE_INDEX = 5
+MASTER_DATA_ENVVAR = "SCAFFOLDING_MASTER_DATA"
+CACHE_EXTENSION = "cache"
+STREAMING_ROW_LIMIT = 5000
+
+def open_csv(file_path):
+    """Opens csv file for reading. Python 2 csv module (IronPython in Revit) reads bytes and
+    Python 3 csv module reads text.
+
+    Args:
+        file_path (str): Path to the csv file.
+
+    Returns:
+        file: Opened file object.
+    """
+
+    if sys.version_info[0] < 3:
+        return open(file_path, "rb")
+    return io.open(file_path, "r", newline="", encoding="utf-8-sig")
+
+def parse_master_data(file_path):
+    """Reads master material list and indexes it by product number. Each product keeps its
+    list price as float and rest of the columns keyed by the header names of the master file.
+    If the same product number occurs multiple times, the first occurrence is used.
+
+    Args:
+        file_path (str): Path to the master material list csv file.
+
+    Returns:
+        tuple: Dictionary of products keyed by product number and list of duplicate product numbers.
+    """
+
+    master_data = {}
+    duplicates = []
+
+    with open_csv(file_path) as f:
         reader = csv.reader(f, delimiter=";")
-        next(reader, None) # Skip the header
-        data = []
+        headers = next(reader, [])
         for row in reader:
-            product_number = row[0]
-            price = float(row[5].replace(",", "."))
-            data.append([product_number, price])
-    return data
+            product_number = row[PRODUCT_NUMBER_INDEX]
+            if product_number in master_data:
+                duplicates.append(product_number)
+                continue
+            product = dict(zip(headers, row))
+            product["price"] = float(row[PRICE_INDEX].replace(",", "."))
+            master_data[product_number] = product
+
+    return master_data, duplicates
+
+def get_file_hash(file_path):
+    """Calculates MD5 hash of the file content. File is read in chunks.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+
+    hasher = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def load_master_data_cache(cache_path):
+    """Loads pickled master data from the cache file. Broken or missing cache is ignored.
+
+    Args:
+        cache_path (str): Path to the cache file.
+
+    Returns:
+        dict: Cache content with keys size, mtime, hash, master_data and duplicates. None if not available.
+    """
+
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def get_master_data_cache_path(file_path):
+    """Returns path of the master data cache in the pyRevit app data of the user, or in the temporary
+    directory of the user outside of Revit. Extension folder is not used, since it can be read-only.
+    Each master file gets its own cache file named by the hash of its path.
+
+    Args:
+        file_path (str): Path to the master material list csv file.
+
+    Returns:
+        str: Path to the cache file.
+    """
+
+    path = os.path.abspath(file_path)
+    if not isinstance(path, bytes):
+        path = path.encode("utf-8")
+    cache_id = "master_data_{}".format(hashlib.md5(path).hexdigest()[:12])
+
+    if script:
+        return script.get_universal_data_file(cache_id, CACHE_EXTENSION)
+    return os.path.join(tempfile.gettempdir(), "{0}.{1}".format(cache_id, CACHE_EXTENSION))
+
+def write_master_data_cache(cache_path, cache):
+    """Stores pickled master data into the cache file. Cache is only an optimization, so
+    a failed write is ignored and the csv file is parsed again next time.
+
+    Args:
+        cache_path (str): Path to the cache file.
+        cache (dict): Cache content with keys size, mtime, hash, master_data and duplicates.
+    """
+
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+    except (IOError, OSError, pickle.PicklingError):
+        pass
+
+def get_cached_master_data(file_path):
+    """Returns parsed master data using two cache levels. Parsed data is kept in memory for the
+    pyRevit session and stored in binary form in the user data directory (see get_master_data_cache_path).
+    Cache is valid when the file size and modification time are unchanged. If only the modification
+    time has changed (ie. file is copied again), the file hash decides whether the csv needs to be
+    parsed again.
+
+    Args:
+        file_path (str): Path to the master material list csv file.
+
+    Returns:
+        tuple: Dictionary of products keyed by product number and list of duplicate product numbers.
+    """
+
+    file_stat = os.stat(file_path)
+    size, mtime = file_stat.st_size, file_stat.st_mtime
+
+    cache = script.get_envvar(MASTER_DATA_ENVVAR) if script else None
+    if not cache or cache.get("path") != file_path or (cache["size"], cache["mtime"]) != (size, mtime):
+        cache_path = get_master_data_cache_path(file_path)
+        cache = load_master_data_cache(cache_path)
+
+        if not cache or cache["size"] != size or cache["mtime"] != mtime:
+            file_hash = get_file_hash(file_path)
+
+            if not cache or cache["size"] != size or cache["hash"] != file_hash:
+                master_data, duplicates = parse_master_data(file_path)
+                cache = {"master_data": master_data, "duplicates": duplicates, "hash": file_hash}
+
+            cache.update({"size": size, "mtime": mtime})
+            write_master_data_cache(cache_path, cache)
+
+        cache["path"] = file_path
+        if script:
+            script.set_envvar(MASTER_DATA_ENVVAR, cache)
+
+    return cache["master_data"], cache["duplicates"]
+
+def get_master_data(file_path, outputter):
+    """Returns master material list indexed by product number. Duplicate product numbers
+    are reported to the user and the first occurrence is used.
+
+    Args:
+        file_path (str): Path to the master material list csv file.
+        outputter: Outputter class to print messages.
+
+    Returns:
+        dict: Dictionary where key is product number and value is dictionary of product information.
+    """
+
+    master_data, duplicates = get_cached_master_data(file_path)
+
+    if duplicates:
+        outputter.print_response(
+            "Master material list",
+            "Duplicate product numbers found. First occurrence is used for: {}".format(", ".join(sorted(set(duplicates)))),
+            "orange"
+        )
+
+    return master_data
 
 def is_file_open(file_path):
     """Checks if the file is currently open by attempting to open it in append mode.
@@ -32,21 +216,104 @@ def is_file_open(file_path):
     except Exception:
         return True 
 
-def write_to_xlsx(project_params, notes, headers, material_list, file_path, outputter):
+def write_material_rows(worksheet, first_row, headers, material_list, header_format, column_formats):
+    """Writes material list header and rows cell by cell in row order without a table object.
+    Row order makes the writing compatible with the constant memory mode of xlsxwriter, where
+    each row is flushed into the file when the next row is started.
+
+    Args:
+        worksheet: xlsxwriter Worksheet class.
+        first_row (int): Zero based row index of the header row.
+        headers (list): List of translated header names.
+        material_list (list): List of material rows.
+        header_format: xlsxwriter Format class for the header row.
+        column_formats (list): xlsxwriter Format class for each column.
+    """
+
+    num_of_cols = len(column_formats)
+    worksheet.write_row(first_row, 1, headers[:num_of_cols], header_format)
+
+    for row_index, row in enumerate(material_list, first_row + 1):
+        for col_index in range(num_of_cols):
+            worksheet.write(row_index, 1 + col_index, row[col_index], column_formats[col_index])
+
+    worksheet.autofilter(first_row, 1, first_row + len(material_list), num_of_cols)
+
+def format_worksheet_name(name, existing_names):
+    """Formats worksheet name which is accepted by Excel. Removes forbidden characters,
+    limits the length to 31 characters and adds a number if the name is already used.
+
+    Args:
+        name (str): Desired worksheet name.
+        existing_names (list): Names of the already added worksheets.
+
+    Returns:
+        str: Valid and unique worksheet name.
+    """
+
+    base_name = re.sub(r"[\[\]:*?/\\]", "_", name).strip("'")[:31] or "Sheet"
+    worksheet_name = base_name
+    counter = 2
+    lower_names = [existing_name.lower() for existing_name in existing_names]
+
+    while worksheet_name.lower() in lower_names:
+        suffix = " ({})".format(counter)
+        worksheet_name = base_name[:31 - len(suffix)] + suffix
+        counter += 1
+
+    return worksheet_name
+
+def write_to_xlsx(project_params, notes, headers, material_list, file_path, outputter, streaming=None, open_file=True, changes=None, change_headers=None, partitions=None, changes_name="Changes"):
+    """Writes material list into Excel file with Main and List worksheets and opens the file.
+    Large material lists are written in streaming mode, which uses constant memory mode of xlsxwriter
+    and writes the rows without table objects.
+
+    Args:
+        project_params (dict): Translated project parameters.
+        notes (list): Additional notes. None if there are no notes.
+        headers (list): List of translated header names.
+        material_list (list): List of material rows.
+        file_path (str): Output file path.
+        outputter: Outputter class to print messages.
+        streaming (bool, optional): Use streaming mode. Defaults to None, which uses streaming for lists longer than STREAMING_ROW_LIMIT.
+        open_file (bool, optional): Open the file after writing. Defaults to True.
+        changes (list, optional): Changes compared to the previous export. Written into Changes worksheet if given. Defaults to None.
+        change_headers (list, optional): List of translated header names for the changes. Defaults to None.
+        partitions (list, optional): List of tuples of partition name and material list. Each partition is written into own worksheet after the project totals. Defaults to None.
+        changes_name (str, optional): Translated name of the Changes worksheet. Defaults to "Changes".
+
+    Returns:
+        bool: True if the file was written, False if the export was cancelled.
+    """
+
     if is_file_open(file_path):
         outputter.print_response("Export cancelled", "File is already opened. Close the Excel file and run the command again", "red")
-        return
+        return False
+
+    if streaming is None:
+        streaming = len(material_list) > STREAMING_ROW_LIMIT
     
-    workbook = xlsxwriter.Workbook(file_path)
+    workbook = xlsxwriter.Workbook(file_path, {"constant_memory": streaming})
     main_worksheet = workbook.add_worksheet("Main")
     list_worksheet = workbook.add_worksheet("List")
+    changes_worksheet = workbook.add_worksheet(format_worksheet_name(changes_name, workbook.sheetnames)) if changes is not None else None
+    partition_worksheets = []
+    for partition_name, partition_list in partitions or []:
+        worksheet = workbook.add_worksheet(format_worksheet_name(partition_name, workbook.sheetnames))
+        partition_worksheets.append((worksheet, partition_list))
     row_counter = 1
 
     column_widths_main = [2, 20, 55, 15, 8.43, 8.43, 8.43, 8.43]
     column_widths_list = [2, 20, 55, 15, 15, 15, 55, 55]
+    column_widths_changes = [2, 15, 20, 55, 15, 15, 15, 15, 15]
     for i in range(8):
         main_worksheet.set_column(i, i, column_widths_main[i])
         list_worksheet.set_column(i, i, column_widths_list[i])
+        for worksheet, _ in partition_worksheets:
+            worksheet.set_column(i, i, column_widths_list[i])
+    if changes_worksheet:
+        for i in range(9):
+            changes_worksheet.set_column(i, i, column_widths_changes[i])
     main_worksheet.set_row(0, 12)
     list_worksheet.set_row(0, 12)
 
@@ -73,7 +340,23 @@ def write_to_xlsx(project_params, notes, headers, material_list, file_path, outp
             row_counter += 1
     
     row_counter += 2
+
+    if changes_worksheet:
+        change_formats = [number_format if col_idx in [6, 7] else material_format for col_idx in range(len(change_headers))]
+        write_material_rows(changes_worksheet, 1, change_headers, changes, material_format, change_formats)
+
+    list_formats = [number_format if col_idx in [3, 4] else material_format for col_idx in range(len(headers))]
+    for worksheet, partition_list in partition_worksheets:
+        write_material_rows(worksheet, 1, headers, partition_list, material_format, list_formats)
     
+    if streaming:
+        write_material_rows(main_worksheet, row_counter - 1, headers, material_list, material_format, [material_format] * 3)
+        write_material_rows(list_worksheet, 1, headers, material_list, material_format, list_formats)
+        workbook.close()
+        if open_file:
+            os.startfile(file_path)
+        return True
+
     table_start_row_main = row_counter
     table_end_row_main = row_counter + len(material_list)
     table_range_main = "B{0}:D{1}".format(table_start_row_main, table_end_row_main)
@@ -104,4 +387,6 @@ def write_to_xlsx(project_params, notes, headers, material_list, file_path, outp
 
     workbook.close()
 
-    os.startfile(file_path)
\ No newline at end of file
+    if open_file:
+        os.startfile(file_path)
+    return True
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from datetime import date
-from pyrevit import revit, DB
 from translations import TRANSLATIONS
 from parameters import get_language, get_project_information_params, INFO_PARAMS, HEADER_PARAMS
 import file_properties as fp
@@ -19,6 +18,9 @@ def get_project_language():
     return language_name
 
 def format_output_filename(outputter, language="ENG"):
+    return format_output_filenames(outputter, [language])[0]
+
+def format_output_filenames(outputter, languages):
     """Formats material list filename based on Revit model file name. Additionally, makes few simple checks if the
     predefined Revit file naming conventions are followed and notifies user if conventions are not followed.
 
@@ -29,15 +31,15 @@ def format_output_filename(outputter, language="ENG"):
         - Filename can not contain other than characters and alphanumerics
         - Filename should start with capital letter
         - Filename can contain zero or one underscore (if there are multiple files for different phases)
-    5. Adds translated "Material list" text with underscore after the filename. Puts it before "_PhaseX" if phasing exists.
+    5. Adds translated "Material list" text with underscore after the filename for each language. Puts it before "_PhaseX" if phasing exists.
     6. Adds "xlsx" suffix
 
     Args:
         outputter: Outputter class to print messages.
-        language (str, optional): Language selection. Defaults to "ENG".
+        languages (list): List of language selections.
 
     Returns:
-        str: Formatted output filaname for material list
+        list: Formatted output filanames for material list in the same order than languages
     """
     revit_filename = fp.get_filename()[0]
 
@@ -53,16 +55,30 @@ def format_output_filename(outputter, language="ENG"):
     if not fp.contains_too_many_underscores(revit_filename):
         outputter.print_response("File naming conventions not followed", "Filename does have too many underscores. Use maximum of one underscore before phase name.", "red")   
 
+    return [format_material_list_filename(revit_filename, language) for language in languages]
+
+def format_material_list_filename(project_filename, language="ENG"):
+    """Adds translated "Material list" text with underscore after the project filename and "xlsx" suffix.
+    Puts the text before "_PhaseX" if phasing exists.
+
+    Args:
+        project_filename (str): Project filename without suffix.
+        language (str, optional): Language selection. Defaults to "ENG".
+
+    Returns:
+        str: Formatted output filaname for material list
+    """
+
     material_list_text = TRANSLATIONS["Material list"].get(language, "ENG")
 
-    if revit_filename.count("_") == 1:
-        splitted_name = revit_filename.split("_")
+    if project_filename.count("_") == 1:
+        splitted_name = project_filename.split("_")
         material_list_filename = splitted_name[0] + "_" + material_list_text + "_" + splitted_name[1] + ".xlsx"
         return material_list_filename
 
-    return revit_filename + "_" + material_list_text + ".xlsx"
+    return project_filename + "_" + material_list_text + ".xlsx"
 
-def get_project_parameters(outputter, language="ENG", total_weight="NA", total_price="NA"):
+def get_project_parameters(outputter, language="ENG", total_weight="NA", total_price="NA", information_params=None):
     """Finds project information parameters from the Revit project. Checks whether
     necessary parameters exists and adds date and totals parameters to the same dictionary. 
     Changes parameter names (key values) with translated parameter names based on the selected language.
@@ -72,13 +88,16 @@ def get_project_parameters(outputter, language="ENG", total_weight="NA", total_p
         language (str, optional): Language selection. Defaults to "ENG".
         total_weight (str, optional): Total weight of the material. Defaults to "NA".
         total_price (str, optional): Total price of the material. Defaults to "NA".
+        information_params (dict, optional): Already read project information parameters. Defaults to None, which reads them from the Revit project.
 
     Returns:
         Dict: Dictionary with translated keys and project parameter values.
     """
 
     translated_project_parameters = {}
-    project_params = get_project_information_params()
+    if information_params is None:
+        information_params = get_project_information_params()
+    project_params = dict(information_params)
 
     for header_name in INFO_PARAMS:
         if header_name not in project_params:
@@ -123,6 +142,14 @@ def get_additional_notes(language="ENG", notes={}):
 
         for item in notes["Anchoring"]:
             additional_notes.append(item)
+        note_number += 1
+
+    if "Tarpaulin cutting" in notes and len(notes["Tarpaulin cutting"]) > 0:
+        translated_note = "{0}) {1}:".format(note_number, TRANSLATIONS["Tarpaulin cutting"].get(language, ""))
+        additional_notes.append(translated_note)
+
+        for item in notes["Tarpaulin cutting"]:
+            additional_notes.append(item)
 
     return additional_notes
 
@@ -130,7 +157,7 @@ def get_headers(language="ENG"):
     headers = []
     main_language_key = "Product name {}".format(language)
     
-    ordered_header_params = HEADER_PARAMS
+    ordered_header_params = list(HEADER_PARAMS)
     ordered_header_params.remove(main_language_key)
     ordered_header_params.insert(1, main_language_key)
 
@@ -139,25 +166,3 @@ def get_headers(language="ENG"):
         headers.append(translated_key)
     
     return headers
-
-def get_schedule_information(schedule_name):
-    schedule_data = []
-    schedules = DB.FilteredElementCollector(revit.doc).OfClass(DB.ViewSchedule).ToElements()
-    for schedule in schedules:
-        if schedule.Name == schedule_name:
-            table_data = schedule.GetTableData()
-            section_data = table_data.GetSectionData(DB.SectionType.Body)
-            num_of_rows = section_data.NumberOfRows
-            num_of_cols = section_data.NumberOfColumns   
-            for i in range(num_of_rows):
-                row = []
-                for j in range(num_of_cols):
-                    cell_value = schedule.GetCellText(DB.SectionType.Body, i, j)
-                    row.append(cell_value)
-                schedule_data.append(row)
-        else:
-            print("ERROR:")
-            print("Can not find schedule named as Material list! Rename the schedule as [Material list] you want to export")
-            print("---")
-
-    return schedule_data
\ No newline at end of file
@@ -2,6 +2,9 @@
 
 import re
 import math
+import bisect
+import operator
+from functools import reduce
 
 def get_tarpaulin_parameters(length, width):
 	tarpaulin_length = float(length)/1000
@@ -11,7 +14,7 @@ def get_tarpaulin_parameters(length, width):
 
 def format_tarpaulin_product_number(product_number, length, width):
 	if width != 2.572:
-		return "KHTASAUS"
+		return CUSTOM_TARPAULIN
 	return "{0}{1}".format(product_number, int(length))
 
 def format_tarpaulin_names(fin, eng, swe, length, width):
@@ -23,46 +26,469 @@ def format_tarpaulin_names(fin, eng, swe, length, width):
 	swe += suffix
 	return fin, eng, swe
 
+def format_tarpaulin_cutting(count, product_number, panels):
+	sizes = ", ".join("{0:.2f} x {1:.2f} m".format(width / 1000.0, length / 1000.0).replace(".", ",") for length, width in panels)
+	return " - {0} x {1}: {2}".format(count, product_number, sizes)
+
 def format_anchor_ledger_name(count, ledger_name):
     formatted_name = re.sub(r"\s*\(.*\)", "", ledger_name)
     formatted_name = " - {0} x {1}".format(count, formatted_name)
 
     return formatted_name
 
-def calculate_wire_sets(length, outputter, set_40=0, set_60=0):
-	if length > 2000000: # Just to prevent memory errors. Input shouldn't be this high anyways.
-		outputter.print_response("Safety wire system", "Desired safety wire length is more than 2 kilometers. Only 60 m sets are used.", "red")
-		return set_40, int(math.ceil(float(length) / 600000))
-	
-	if length <= 0:
-		return set_40, set_60
-	
-	if length > 80000:
-		return calculate_wire_sets(length - 60000, set_40, set_60 + 1)
-	
-	result_40 = calculate_wire_sets(length - 40000, set_40 + 1, set_60)
-	result_60 = calculate_wire_sets(length - 60000, set_40, set_60 + 1)
+SAFETY_WIRE = "VALJAS"
+MASTER_WEIGHT_HEADER = "Weight"
+# Weight (kg) and price (€) by set length (mm). Used for the sets which are not found from the master list.
+DEFAULT_WIRE_SETS = {40000: (25, 1500), 60000: (35, 2000)}
 
-	if sum(result_40) < sum(result_60):
-		return result_40
-	
-	elif sum(result_40) > sum(result_60):
-		return result_60
-	
-	return result_40 if result_40[0] >= result_60[0] else result_60
+def get_master_weight(product):
+	"""Reads weight of the product from the Weight column of the master data.
+
+	Returns:
+		float: Weight in kilograms. None if the master data does not contain the weight.
+	"""
 
+	try:
+		return float(product.get(MASTER_WEIGHT_HEADER, "").replace(",", "."))
+	except ValueError:
+		return None
 
-def create_material_list(outputter, schedule_data, master_data, language="ENG"):
-	material_list = []
-	language_index = {"FIN": 2, "ENG": 3, "SWE": 4}[language]
-	total_weight = 0.00
-	total_price = 0.00
+def get_wire_sets(master_data):
+	"""Finds available safety wire sets from the master data. Safety wire sets are named as
+	VALJAS followed by the set length in meters (ie. VALJAS40). Weight is read from the master data
+	or, if it is missing, from the default sets. Weight of other set lengths is unknown (None).
+	Fixed default sets are used if the master data does not contain any safety wire sets.
+
+	Args:
+		master_data (dict): Master data indexed by product number.
+
+	Returns:
+		dict: Dictionary where key is set length in millimeters and value is tuple of product number, weight and price.
+	"""
+
+	wire_sets = {}
+	for product_number, product in master_data.items():
+		match = re.match(r"^{}(\d+)$".format(SAFETY_WIRE), product_number)
+		if match:
+			set_length = int(match.group(1)) * 1000
+			weight = get_master_weight(product)
+			if weight is None and set_length in DEFAULT_WIRE_SETS:
+				weight = DEFAULT_WIRE_SETS[set_length][0]
+			wire_sets[set_length] = (product_number, weight, product["price"])
+
+	if not wire_sets:
+		for set_length, (weight, price) in DEFAULT_WIRE_SETS.items():
+			wire_sets[set_length] = ("{0}{1}".format(SAFETY_WIRE, set_length // 1000), weight, price)
+
+	return wire_sets
+
+def greatest_common_divisor(a, b):
+	while b:
+		a, b = b, a % b
+	return a
+
+def calculate_wire_sets(length, set_prices):
+	"""Finds the cheapest combination of safety wire sets which covers the given length.
+	Uses dynamic programming over the length units, where unit is the greatest common divisor
+	of the set lengths. Running time is linear to the length. Equally priced combinations are
+	resolved by the smaller number of sets.
+
+	Args:
+		length (float): Safety wire length in millimeters.
+		set_prices (dict): Dictionary where key is set length in millimeters and value is price.
+
+	Returns:
+		dict: Dictionary where key is set length in millimeters and value is number of sets.
+	"""
+
+	if length <= 0 or not set_prices:
+		return {}
+
+	set_lengths = sorted(set_prices)
+	unit = reduce(greatest_common_divisor, set_lengths)
+	units = int(math.ceil(float(length) / unit))
+	set_units = [(set_length, set_length // unit, set_prices[set_length]) for set_length in set_lengths]
+
+	# Each item is tuple of price, number of sets and the last set length used to cover the units.
+	best = [(0.00, 0, None)] * (units + 1)
+	for i in range(1, units + 1):
+		best[i] = min(
+			(best[max(0, i - n)][0] + price, best[max(0, i - n)][1] + 1, set_length)
+			for set_length, n, price in set_units
+		)
+
+	wire_sets = {}
+	i = units
+	while i > 0:
+		set_length = best[i][2]
+		wire_sets[set_length] = wire_sets.get(set_length, 0) + 1
+		i = max(0, i - set_length // unit)
+
+	return wire_sets
+
+def add_wire_sets(wire_sets, other_sets, multiplier=1):
+	for set_length, number_of_sets in other_sets.items():
+		wire_sets[set_length] = wire_sets.get(set_length, 0) + multiplier * number_of_sets
+	return wire_sets
+
+def get_stock_price(stocks, stock_prices):
+	return sum(number_of_stocks * stock_prices[stock_length] for stock_length, number_of_stocks in stocks.items())
+
+def pack_piece_layouts(pieces, stock_prices):
+	"""Packs pieces into stock lengths (ie. safety wire sets or tarpaulins) using best fit decreasing
+	heuristic. Pieces are first packed into the longest stock and each used stock is afterwards
+	replaced by the cheapest stock which still fits all of its pieces. Open stocks are kept sorted
+	by the used length, so the best fitting stock is found with binary search.
+
+	Args:
+		pieces (list): List of tuples of piece length in millimeters and piece content. Each piece must fit into the longest stock.
+		stock_prices (dict): Dictionary where key is stock length in millimeters and value is price.
+
+	Returns:
+		list: List of tuples of stock length in millimeters and list of piece contents cut from the stock.
+	"""
+
+	stock_lengths = sorted(stock_prices)
+	longest_stock = stock_lengths[-1]
+	used_lengths = []
+	contents = []
+
+	for piece, content in sorted(pieces, key=lambda piece: piece[0], reverse=True):
+		index = bisect.bisect_right(used_lengths, longest_stock - piece) - 1
+		if index >= 0:
+			used_length = used_lengths.pop(index) + piece
+			stock_content = contents.pop(index) + [content]
+		else:
+			used_length = piece
+			stock_content = [content]
+		index = bisect.bisect_right(used_lengths, used_length)
+		used_lengths.insert(index, used_length)
+		contents.insert(index, stock_content)
+
+	layouts = []
+	for used_length, stock_content in zip(used_lengths, contents):
+		stock_length = min((stock_prices[stock_length], stock_length) for stock_length in stock_lengths if stock_length >= used_length)[1]
+		layouts.append((stock_length, stock_content))
+
+	return layouts
+
+def pack_pieces(pieces, stock_prices):
+	"""Packs pieces into stock lengths with pack_piece_layouts.
+
+	Args:
+		pieces (list): List of piece lengths in millimeters. Each piece must fit into the longest stock.
+		stock_prices (dict): Dictionary where key is stock length in millimeters and value is price.
+
+	Returns:
+		dict: Dictionary where key is stock length in millimeters and value is number of stocks.
+	"""
+
+	stocks = {}
+	for stock_length, _ in pack_piece_layouts([(piece, None) for piece in pieces], stock_prices):
+		stocks[stock_length] = stocks.get(stock_length, 0) + 1
+
+	return stocks
+
+def optimize_wire_sets(wire_runs, set_prices):
+	"""Finds safety wire sets for all wire runs in the project jointly. Each run is first
+	solved separately with calculate_wire_sets. The smallest set of each run is then replaced
+	by a piece covering the rest of the run, and these pieces are packed together into shared
+	sets (ie. two 20 m runs can be cut from one 40 m set). Result of the joint packing is used
+	only if it is cheaper than solving the runs independently.
+
+	Args:
+		wire_runs (list): List of tuples where 1st item is run length in millimeters and 2nd item is number of runs.
+		set_prices (dict): Dictionary where key is set length in millimeters and value is price.
+
+	Returns:
+		dict: Dictionary where key is set length in millimeters and value is number of sets.
+	"""
+
+	independent_sets = {}
+	full_sets = {}
+	pieces = []
+
+	for length, count in wire_runs:
+		run_sets = calculate_wire_sets(length, set_prices)
+		if not run_sets:
+			continue
+		add_wire_sets(independent_sets, run_sets, count)
+
+		smallest_set = min(run_sets)
+		run_sets[smallest_set] -= 1
+		add_wire_sets(full_sets, run_sets, count)
+
+		piece = length - sum(set_length * number_of_sets for set_length, number_of_sets in run_sets.items())
+		if piece > 0:
+			pieces.extend([piece] * count)
+
+	joint_sets = add_wire_sets(full_sets, pack_pieces(pieces, set_prices)) if pieces else full_sets
+	joint_sets = {set_length: number_of_sets for set_length, number_of_sets in joint_sets.items() if number_of_sets > 0}
+
+	if get_stock_price(joint_sets, set_prices) < get_stock_price(independent_sets, set_prices):
+		return joint_sets
+	return independent_sets
+
+
+TARPAULIN = "KHKATT"
+CUSTOM_TARPAULIN = "KHTASAUS"
+TARPAULIN_WIDTH = 2.572
+TARPAULIN_WEIGHT = 0.67 # kg/m2
+TARPAULIN_PRICE = 12.7 # €/m2, custom sized tarpaulins
+
+def get_tarpaulin_stock(master_data):
+	"""Finds available stock tarpaulins from the master data. Stock tarpaulins are full width
+	tarpaulins named as KHKATT followed by the length in meters (ie. KHKATT6).
+
+	Args:
+		master_data (dict): Master data indexed by product number.
+
+	Returns:
+		dict: Dictionary where key is stock length in millimeters and value is price.
+	"""
+
+	stock_prices = {}
+	for product_number, product in master_data.items():
+		match = re.match(r"^{}(\d+)$".format(TARPAULIN), product_number)
+		if match:
+			stock_prices[int(match.group(1)) * 1000] = product["price"]
+
+	return stock_prices
+
+def get_custom_tarpaulin_price(length, width):
+	return round(length * width / 1000000 * TARPAULIN_PRICE, 2)
+
+def nest_tarpaulin_strips(panels, stock_width):
+	"""Nests narrow panels side by side across the tarpaulin width using first fit decreasing
+	shelf packing. Panels are handled from the longest, so the first panel of the strip defines
+	the strip length and every later panel fits into it lengthwise.
+
+	Args:
+		panels (list): List of tuples of panel length and width in millimeters.
+		stock_width (int): Width of the stock tarpaulin in millimeters.
+
+	Returns:
+		list: List of tuples of strip length in millimeters and list of panels nested into the strip.
+	"""
+
+	strips = [] # Each item is list of strip length, used width and panels
+	for length, width in sorted(panels, reverse=True):
+		for strip in strips:
+			if strip[1] + width <= stock_width:
+				strip[1] += width
+				strip[2].append((length, width))
+				break
+		else:
+			strips.append([length, width, [(length, width)]])
+
+	return [(strip[0], strip[2]) for strip in strips]
+
+def optimize_tarpaulins(panels, stock_prices):
+	"""Packs roof tarpaulin panels into stock tarpaulins. Narrow panels are first nested side by side
+	into full width strips and the strips and full width panels are then cut lengthwise from the stock
+	tarpaulins with pack_piece_layouts. Panels which do not fit into the longest stock or are wider than the
+	stock remain custom sized. Layout is used only if it is cheaper than ordering every panel custom sized.
+
+	Args:
+		panels (list): List of tuples of panel length and width in millimeters. Panel is repeated by its count.
+		stock_prices (dict): Dictionary where key is stock length in millimeters and value is price.
+
+	Returns:
+		tuple: List of tuples of stock length and panels cut from the stock and list of custom sized panels. None if nesting is not cheaper.
+	"""
+
+	if not stock_prices or not panels:
+		return None
+
+	stock_width = int(round(TARPAULIN_WIDTH * 1000))
+	longest_stock = max(stock_prices)
+	custom_panels = []
+	pieces = []
+	narrow_panels = []
+
+	for length, width in panels:
+		if width > stock_width or length > longest_stock:
+			custom_panels.append((length, width))
+		elif width == stock_width:
+			pieces.append((length, [(length, width)]))
+		else:
+			narrow_panels.append((length, width))
+
+	pieces.extend(nest_tarpaulin_strips(narrow_panels, stock_width))
+	layouts = [(stock_length, [panel for strip in strip_panels for panel in strip]) for stock_length, strip_panels in pack_piece_layouts(pieces, stock_prices)]
+	nested_price = sum(stock_prices[stock_length] for stock_length, _ in layouts) + sum(get_custom_tarpaulin_price(length, width) for length, width in custom_panels)
+	custom_price = sum(get_custom_tarpaulin_price(length, width) for length, width in panels)
+
+	if nested_price < custom_price:
+		return layouts, custom_panels
+	return None
+
+def create_custom_tarpaulin_row(count, names, length, width, stock_product_numbers=()):
+	"""Creates material row of a custom sized tarpaulin priced by its area. Full width tarpaulins are
+	named by their length (ie. KHKATT5), but if the same product number is a stock tarpaulin with a
+	list price, the custom tarpaulin is listed as KHTASAUS to keep the differently priced rows apart.
+
+	Returns:
+		MaterialRow: Material row of the tarpaulin.
+	"""
+
+	tarpaulin_length, tarpaulin_width, tarpaulin_area = get_tarpaulin_parameters(length, width)
+	product_number = format_tarpaulin_product_number(TARPAULIN, tarpaulin_length, tarpaulin_width)
+	if product_number in stock_product_numbers:
+		product_number = CUSTOM_TARPAULIN
+	name_fin, name_eng, name_swe = format_tarpaulin_names(names[0], names[1], names[2], tarpaulin_length, tarpaulin_width)
+	weight = round(tarpaulin_area * TARPAULIN_WEIGHT, 2)
+	price = round(tarpaulin_area * TARPAULIN_PRICE, 2)
+
+	return MaterialRow(count, product_number, name_fin, name_eng, name_swe, weight, price)
+
+def create_stock_tarpaulin_row(count, names, stock_length, master_data):
+	"""Creates material row of a stock tarpaulin. Names and price are read from the master data.
+	Names of the panel with the stock size are used if the master data does not contain names.
+
+	Returns:
+		MaterialRow: Material row of the stock tarpaulin.
+	"""
+
+	product_number = "{0}{1}".format(TARPAULIN, stock_length // 1000)
+	product = master_data[product_number]
+	row = create_custom_tarpaulin_row(count, names, stock_length, int(round(TARPAULIN_WIDTH * 1000)))
+	row.product_number = product_number
+	row.name_fin, row.name_eng, row.name_swe = [
+		product.get(MASTER_NAME_HEADERS[language]) or default_name
+		for language, default_name in zip(LANGUAGES, (row.name_fin, row.name_eng, row.name_swe))
+	]
+	row.price = product["price"]
+
+	return row
+
+def format_tarpaulin_layouts(layouts):
+	"""Groups identical stock tarpaulin layouts for the cutting list.
+
+	Args:
+		layouts (list): List of tuples of stock length and panels cut from the stock.
+
+	Returns:
+		list: List of tuples of number of stocks, stock product number and panels (length and width in millimeters).
+	"""
+
+	counts = {}
+	for stock_length, panels in layouts:
+		key = ("{0}{1}".format(TARPAULIN, stock_length // 1000), tuple(sorted(panels, reverse=True)))
+		counts[key] = counts.get(key, 0) + 1
+
+	return [(count, product_number, panels) for (product_number, panels), count in sorted(counts.items())]
+
+def create_tarpaulin_rows(tarpaulins, master_data):
+	"""Creates material rows for the roof tarpaulins. Panels are nested into stock tarpaulins
+	when the master data contains stock tarpaulins and nesting is cheaper than custom sized panels.
+	Otherwise each panel is listed as custom sized tarpaulin priced by its area.
+
+	Args:
+		tarpaulins (list): List of tuples of count, names (FIN, ENG, SWE), length and width in millimeters.
+		master_data (dict): Master data indexed by product number.
+
+	Returns:
+		tuple: List of MaterialRow objects and cutting list of the stock tarpaulins (see format_tarpaulin_layouts).
+	"""
+
+	stock_prices = get_tarpaulin_stock(master_data)
+	stock_product_numbers = set("{0}{1}".format(TARPAULIN, stock_length // 1000) for stock_length in stock_prices)
+	panels = []
+	for count, _, length, width in tarpaulins:
+		panels.extend([(int(round(float(length))), int(round(float(width))))] * count)
+
+	layout = optimize_tarpaulins(panels, stock_prices)
+	if layout is None:
+		rows = [create_custom_tarpaulin_row(count, names, length, width, stock_product_numbers) for count, names, length, width in tarpaulins]
+		return rows, []
+
+	layouts, custom_panels = layout
+	names = tarpaulins[0][1]
+	rows = []
+
+	stocks = {}
+	for stock_length, _ in layouts:
+		stocks[stock_length] = stocks.get(stock_length, 0) + 1
+	for stock_length in sorted(stocks):
+		rows.append(create_stock_tarpaulin_row(stocks[stock_length], names, stock_length, master_data))
+
+	custom_counts = {}
+	for panel in custom_panels:
+		custom_counts[panel] = custom_counts.get(panel, 0) + 1
+	for (length, width), count in sorted(custom_counts.items()):
+		rows.append(create_custom_tarpaulin_row(count, names, length, width, stock_product_numbers))
+
+	return rows, format_tarpaulin_layouts(layouts)
+
+LANGUAGES = ["FIN", "ENG", "SWE"]
+MASTER_NAME_HEADERS = {language: "Product name {}".format(language) for language in LANGUAGES}
+NAME_FIELDS = {"FIN": "name_fin", "ENG": "name_eng", "SWE": "name_swe"}
+# Exported column order for each language. Getter is created once and reused for every row.
+COLUMN_ORDERS = {
+	language: operator.attrgetter(*(["product_number", name_field, "count", "weight", "price"] + [NAME_FIELDS[other] for other in LANGUAGES if other != language]))
+	for language, name_field in NAME_FIELDS.items()
+}
+
+class MaterialRow(object):
+	"""Language independent material row. Slots keep the rows compact when material lists
+	of many projects are aggregated."""
+
+	__slots__ = ("count", "product_number", "name_fin", "name_eng", "name_swe", "weight", "price")
+
+	def __init__(self, count, product_number, name_fin, name_eng, name_swe, weight, price):
+		self.count = count
+		self.product_number = product_number
+		self.name_fin = name_fin
+		self.name_eng = name_eng
+		self.name_swe = name_swe
+		self.weight = weight
+		self.price = price
+
+def sum_totals(rows):
+	"""Sums total weight and price of the material rows column by column. Rows with unknown
+	weight (None) are left out of the total weight.
+
+	Args:
+		rows (list): List of MaterialRow objects.
+
+	Returns:
+		tuple: Total weight and total price.
+	"""
+
+	counts = [row.count for row in rows]
+	total_weight = math.fsum(map(operator.mul, counts, [row.weight or 0.00 for row in rows]))
+	total_price = math.fsum(map(operator.mul, counts, [row.price for row in rows]))
+	return total_weight, total_price
+
+def aggregate_material_list(schedule_data, master_data, outputter=None):
+	"""Creates language independent material rows from the schedule data. Rows keep names in all
+	languages, so the same aggregated data can be written in any language with localize_material_list.
+	Weight of the schedule rows which are not in the material list (ie. notes and safety wires) is
+	included in the total weight. Roof tarpaulins are nested into stock tarpaulins with create_tarpaulin_rows.
+	Safety wire sets with unknown weight are left without weight and reported to the user.
+
+	Args:
+		schedule_data (list): List of schedule rows where the first row contains headers.
+		master_data (dict): Master data indexed by product number.
+		outputter (optional): Outputter class to print warnings. Defaults to None, which does not print warnings.
+
+	Returns:
+		tuple: List of MaterialRow objects, raw notes and tuple of total weight and total price.
+	"""
+
+	rows = []
+	unlisted_weight = 0.00
 	notes = {}
 	roof_system = False
-	safety_wire_sets = (0, 0)
+	wire_sets = get_wire_sets(master_data)
+	set_prices = {set_length: wire_set[2] for set_length, wire_set in wire_sets.items()}
+	wire_runs = []
+	safety_wire_names = None
+	tarpaulins = []
 
 	if len(schedule_data) == 0:
-		return material_list, notes, (total_weight, total_price)
+		return rows, notes, (0.00, 0.00)
 
 	for product in schedule_data[1:]:
 		count = int(product[0])
@@ -71,99 +497,94 @@ def create_material_list(outputter, schedule_data, master_data, language="ENG"):
 		name_eng = product[3]
 		name_swe = product[4]
 		weight = float(product[5])
-		total_weight += weight * int(count)
+		schedule_weight = weight * count
 		found = False
+		listed = False # Row is in the material list with the schedule weight
 
-		if product_number == "KHKATT" and len(product) >= 8:
+		if product_number == TARPAULIN and len(product) >= 8:
 			roof_system = True
-			tarpaulin_length, tarpaulin_width, tarpaulin_area = get_tarpaulin_parameters(product[6], product[7])
-			edited_product_number = format_tarpaulin_product_number(product_number, tarpaulin_length, tarpaulin_width)
-			edited_name_fin, edited_name_eng, edited_name_swe = format_tarpaulin_names(name_fin, name_eng, name_swe, tarpaulin_length, tarpaulin_width)
-			
-			weight = round(tarpaulin_area * 0.67, 2)
-			price = round(tarpaulin_area * 12.7, 2)
-			total_weight += weight * int(count)
-			total_price += price * int(count)
-
-			row = [count, edited_product_number, edited_name_fin, edited_name_eng, edited_name_swe, weight, price]
-			sorted_row = sort_rows(language_index, row)
-			material_list.append(sorted_row)
+			tarpaulins.append((count, (name_fin, name_eng, name_swe), product[6], product[7]))
 			found = True # Do not add this row into material list
-		else:
-			for master_product in master_data:
-				m_product_number = master_product[0]
-				m_price = master_product[1]
-
-				if product_number == m_product_number:
-					row = [count, product_number, name_fin, name_eng, name_swe, weight, m_price]
-					sorted_row = sort_rows(language_index, row)
-					material_list.append(sorted_row)
-					total_price += m_price * int(count)
-					found = True # Do not add this row into material list
-					break
+		elif product_number in master_data:
+			rows.append(MaterialRow(count, product_number, name_fin, name_eng, name_swe, weight, master_data[product_number]["price"]))
+			found = True # Do not add this row into material list
+			listed = True
 		
 		if product_number == "SUSPENDED":
-			notes["Suspended"] = product[language_index]
+			notes["Suspended"] = (name_fin, name_eng, name_swe)
 			found = True # Do not add this row into material list
 		
 		if product_number.startswith("AL"):
-			formatted_note = format_anchor_ledger_name(count, product[language_index])
-			notes.setdefault("Anchoring", []).append(formatted_note)
+			notes.setdefault("Anchoring", []).append((count, (name_fin, name_eng, name_swe)))
 			found = True # Do not add this row into material list
 		
-		if product_number == "VALJAS":
+		if product_number == SAFETY_WIRE:
 			wire_set_length = float(product[6])
-			number_of_40_sets, number_of_60_sets = calculate_wire_sets(wire_set_length, outputter)
-			safety_wire_sets = (safety_wire_sets[0] + count * number_of_40_sets, safety_wire_sets[1] + count * number_of_60_sets)
+			wire_runs.append((wire_set_length, count))
+			safety_wire_names = (name_fin, name_eng, name_swe)
 			found = True # Do not add this row into material list
 
 		if not found:
-			row = [count, product_number, name_fin, name_eng, name_swe, weight, 0.00]
-			sorted_row = sort_rows(language_index, row)
-			material_list.append(sorted_row)
+			rows.append(MaterialRow(count, product_number, name_fin, name_eng, name_swe, weight, 0.00))
+			listed = True
+
+		if not listed:
+			unlisted_weight += schedule_weight
 		
 	if roof_system:
-		row = [0, "KHPÄÄT", "Muista lisätä päätypeitteet", "REMEMBER GABLE TARPAULINS", "Komma ihåg gavelduk", 0.00, 0.00]
-		sorted_row = sort_rows(language_index, row)
-		material_list.append(sorted_row)
+		tarpaulin_rows, tarpaulin_layouts = create_tarpaulin_rows(tarpaulins, master_data)
+		rows.extend(tarpaulin_rows)
+		if tarpaulin_layouts:
+			notes["Tarpaulin cutting"] = tarpaulin_layouts
+		rows.append(MaterialRow(0, "KHPÄÄT", "Muista lisätä päätypeitteet", "REMEMBER GABLE TARPAULINS", "Komma ihåg gavelduk", 0.00, 0.00))
 	
-	if safety_wire_sets != (0, 0):
-		number_of_40_sets, number_of_60_sets = safety_wire_sets
-
-		# At the moment these are just fixed values to get rough estimates.
-		# Later on, read the values from master list.
-		weight_40 = 25
-		weight_60 = 35
-		price_40 = 1500
-		price_60 = 2000
-		total_weight += number_of_40_sets * weight_40 + number_of_60_sets + weight_60
-		total_price += number_of_40_sets * price_40 + number_of_60_sets * price_60
-
-		if number_of_40_sets > 0:
-			row = [number_of_40_sets, product_number + "40", name_fin + " 40 m", name_eng + " 40 M", name_swe + " 40 m", weight_40, price_40]
-			sorted_row = sort_rows(language_index, row)
-			material_list.append(sorted_row)
-
-		if number_of_60_sets > 0:
-			row = [number_of_60_sets, product_number + "60", name_fin + " 60 m", name_eng + " 60 M", name_swe + " 60 m", weight_60, price_60]
-			sorted_row = sort_rows(language_index, row)
-			material_list.append(sorted_row)		
-
-	return material_list, notes, (total_weight, total_price)
-
-def sort_rows(language_index, row):
-	"""Raw row order:
-	0:	count
-	1:	product number
-	2:	name FIN
-	3:	name ENG
-	4:	name SWE
-	5:	weight
-	6:	price
-	"""
-
-	secondary_names_indexes = [2, 3, 4]
-	secondary_names_indexes.remove(language_index)
-	sorted_indexes = [1, language_index, 0, 5, 6] + secondary_names_indexes
-	
-	return [row[i] for i in sorted_indexes]
\ No newline at end of file
+	safety_wire_sets = optimize_wire_sets(wire_runs, set_prices)
+	for set_length in sorted(safety_wire_sets):
+		number_of_sets = safety_wire_sets[set_length]
+		set_product_number, set_weight, set_price = wire_sets[set_length]
+		wire_name_fin, wire_name_eng, wire_name_swe = safety_wire_names
+		suffix = " {} m".format(set_length // 1000)
+
+		rows.append(MaterialRow(number_of_sets, set_product_number, wire_name_fin + suffix, wire_name_eng + suffix.upper(), wire_name_swe + suffix, set_weight, set_price))
+		if set_weight is None and outputter:
+			outputter.print_response(
+				"Safety wire sets",
+				"Weight of {} is not found from the master material list. Total weight does not include it.".format(set_product_number),
+				"orange"
+			)
+
+	total_weight, total_price = sum_totals(rows)
+	return rows, notes, (total_weight + unlisted_weight, total_price)
+
+def localize_material_list(rows, notes, language="ENG"):
+	"""Reorders aggregated material rows and notes for the given language. Rows and notes
+	are not modified, so the same aggregated data can be localized for every language.
+
+	Args:
+		rows (list): List of MaterialRow objects from aggregate_material_list.
+		notes (dict): Raw notes from aggregate_material_list.
+		language (str, optional): Language selection. Defaults to "ENG".
+
+	Returns:
+		tuple: List of sorted material rows (tuples) and notes in the given language.
+	"""
+
+	name_index = LANGUAGES.index(language)
+	material_list = list(map(COLUMN_ORDERS[language], rows))
+	localized_notes = {}
+
+	if "Suspended" in notes:
+		localized_notes["Suspended"] = notes["Suspended"][name_index]
+
+	if "Anchoring" in notes:
+		localized_notes["Anchoring"] = [format_anchor_ledger_name(count, names[name_index]) for count, names in notes["Anchoring"]]
+
+	if "Tarpaulin cutting" in notes:
+		localized_notes["Tarpaulin cutting"] = [format_tarpaulin_cutting(*layout) for layout in notes["Tarpaulin cutting"]]
+
+	return material_list, localized_notes
+
+def create_material_list(outputter, schedule_data, master_data, language="ENG"):
+	rows, notes, totals = aggregate_material_list(schedule_data, master_data, outputter)
+	material_list, localized_notes = localize_material_list(rows, notes, language)
+	return material_list, localized_notes, totals
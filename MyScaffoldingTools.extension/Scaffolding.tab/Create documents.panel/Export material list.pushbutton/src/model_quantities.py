@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+from pyrevit import revit, DB
+from products import collect_generic_models
+
+PHASE = "Phase"
+ZONE = "Zone"
+UNASSIGNED = "Unassigned"
+QUANTITY_PARAMS = ["Product number", "Product name (FIN)", "Product name (ENG)", "Product name (SWE)", "Weight", "Length info", "Width info"]
+
+def get_parameter_text(param):
+    """Converts parameter value into the same textual form than in the material list schedule.
+    Length parameters are converted from Revit internal units into millimeters.
+
+    Args:
+        param: Autodesk.Revit.DB.Parameter class or None.
+
+    Returns:
+        str: Parameter value as string. Empty string if parameter does not exist or has no value.
+    """
+
+    if param is None or not param.HasValue:
+        return ""
+
+    if param.StorageType == DB.StorageType.String:
+        return param.AsString() or ""
+
+    if param.StorageType == DB.StorageType.Integer:
+        return str(param.AsInteger())
+
+    if param.StorageType == DB.StorageType.Double:
+        value = param.AsDouble()
+        if param.Definition.GetDataType() == DB.SpecTypeId.Length:
+            return "{:.0f}".format(DB.UnitUtils.ConvertFromInternalUnits(value, DB.UnitTypeId.Millimeters))
+        return "{}".format(value)
+
+    return ""
+
+def get_type_information(element, type_cache):
+    """Finds out which quantity parameters are instance parameters and reads values of the type
+    parameters. Result is cached by the type id, so each family type is read only once.
+
+    Args:
+        element: Autodesk.Revit.DB Element class.
+        type_cache (dict): Cache where key is type id and value is tuple of instance parameter names and type values.
+
+    Returns:
+        tuple: List of instance parameter names and dictionary of type parameter values.
+    """
+
+    type_id = element.GetTypeId()
+    if type_id not in type_cache:
+        element_type = revit.doc.GetElement(type_id)
+        instance_params = [name for name in QUANTITY_PARAMS if element.LookupParameter(name)]
+        type_values = {}
+
+        for name in QUANTITY_PARAMS:
+            if name not in instance_params:
+                type_values[name] = get_parameter_text(element_type.LookupParameter(name) if element_type else None)
+
+        type_cache[type_id] = (instance_params, type_values)
+
+    return type_cache[type_id]
+
+def get_partition_name(element, partition_by, phase_names):
+    """Finds partition name of the element. Partition is either the phase where element is created
+    or the value of the given zone parameter.
+
+    Args:
+        element: Autodesk.Revit.DB Element class.
+        partition_by (str): PHASE or name of the zone parameter.
+        phase_names (dict): Cache where key is phase id and value is phase name.
+
+    Returns:
+        str: Partition name. UNASSIGNED if element has no phase or zone.
+    """
+
+    if partition_by == PHASE:
+        phase_id = element.CreatedPhaseId
+        if phase_id not in phase_names:
+            phase = revit.doc.GetElement(phase_id)
+            phase_names[phase_id] = phase.Name if phase else UNASSIGNED
+        return phase_names[phase_id]
+
+    return get_parameter_text(element.LookupParameter(partition_by)) or UNASSIGNED
+
+def count_model_quantities(partition_by=None):
+    """Counts scaffolding components straight from the model in one pass. Components are grouped
+    by their product number, product names, weight and length and width info, and optionally by partition.
+
+    Args:
+        partition_by (str, optional): PHASE or name of the zone parameter. Defaults to None, which does not partition the components.
+
+    Returns:
+        dict: Dictionary where key is tuple of partition name and quantity values and value is count.
+    """
+
+    type_cache = {}
+    phase_names = {}
+    quantities = {}
+
+    for element in collect_generic_models():
+        instance_params, type_values = get_type_information(element, type_cache)
+        values = tuple(
+            get_parameter_text(element.LookupParameter(name)) if name in instance_params else type_values[name]
+            for name in QUANTITY_PARAMS
+        )
+
+        if values[0]:
+            partition = get_partition_name(element, partition_by, phase_names) if partition_by else None
+            key = (partition, values)
+            quantities[key] = quantities.get(key, 0) + 1
+
+    return quantities
+
+def format_schedule_data(quantities):
+    """Formats counted quantities into the same rows than the material list schedule. First row contains headers.
+
+    Args:
+        quantities (dict): Dictionary where key is tuple of quantity values and value is count.
+
+    Returns:
+        list: List of rows where row contains count, product number, names (FIN, ENG, SWE), weight, length info and width info.
+    """
+
+    schedule_data = [["Count"] + QUANTITY_PARAMS]
+    for values in sorted(quantities):
+        schedule_data.append([str(quantities[values])] + list(values))
+
+    return schedule_data
+
+def get_model_quantities():
+    """Counts scaffolding components straight from the model in one pass and returns the rows of the whole project.
+
+    Returns:
+        list: List of rows where row contains count, product number, names (FIN, ENG, SWE), weight, length info and width info.
+    """
+
+    quantities = {}
+    for (_, values), count in count_model_quantities().items():
+        quantities[values] = count
+
+    return format_schedule_data(quantities)
+
+def get_partitioned_model_quantities(partition_by):
+    """Counts scaffolding components by phase or zone in one pass over the model. Totals of the
+    whole project are summed from the same counts.
+
+    Args:
+        partition_by (str): PHASE or name of the zone parameter.
+
+    Returns:
+        tuple: Rows of the whole project and dictionary where key is partition name and value is rows of the partition.
+    """
+
+    totals = {}
+    partitions = {}
+
+    for (partition, values), count in count_model_quantities(partition_by).items():
+        totals[values] = totals.get(values, 0) + count
+        partition_quantities = partitions.setdefault(partition, {})
+        partition_quantities[values] = count
+
+    partition_data = {partition: format_schedule_data(quantities) for partition, quantities in partitions.items()}
+
+    return format_schedule_data(totals), partition_data
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import re
-from pyrevit import revit
+try:
+    from pyrevit import revit
+except ImportError: # Headless use outside of Revit
+    revit = None
 
 def get_filename():
     revit_file_path = revit.doc.PathName
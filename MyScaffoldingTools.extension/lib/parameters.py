@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from pyrevit import revit, DB
+try:
+    from pyrevit import revit, DB
+    from System.Collections.Generic import List
+except ImportError: # Headless use outside of Revit
+    revit = DB = List = None
 
 INFO_PARAMS = ["Author", "Client Name", "Project Address", "Project Name", "Supervisor name"]
 HEADER_PARAMS = ["Product number", "Count", "Weight", "List price", "Product name FIN", "Product name ENG", "Product name SWE"]
@@ -63,4 +67,44 @@ def get_project_load_params():
             load_params_dict[load_param_name] = load_param_value
     
 
-    return load_params_dict
\ No newline at end of file
+    return load_params_dict
+
+def get_shared_parameter_guids(param_names):
+    """Resolves shared parameter definitions of the document by their names.
+
+    Args:
+        param_names (list): Names of the shared parameters.
+
+    Returns:
+        dict: Dictionary where key is parameter name and value is list of shared parameter GUIDs.
+    """
+
+    shared_param_guids = {}
+    shared_params = DB.FilteredElementCollector(revit.doc).OfClass(DB.SharedParameterElement)
+
+    for shared_param in shared_params:
+        if shared_param.Name in param_names:
+            shared_param_guids.setdefault(shared_param.Name, []).append(shared_param.GuidValue)
+
+    return shared_param_guids
+
+def collect_shared_parameter_hosts(param_names, category=None):
+    """Collects elements which have any of the given shared parameters. Parameters are checked
+    with Revit parameter filter, so parameters of the other elements are not iterated.
+
+    Args:
+        param_names (list): Names of the shared parameters.
+        category (Autodesk.Revit.DB.BuiltInCategory, optional): Limits the search into the category. Defaults to None.
+
+    Returns:
+        Autodesk.Revit.DB.FilteredElementCollector: Elements with the shared parameters.
+    """
+
+    parameter_filters = [DB.ElementParameterFilter(DB.SharedParameterApplicableRule(name)) for name in param_names]
+    host_filter = DB.LogicalOrFilter(List[DB.ElementFilter](parameter_filters)) if len(parameter_filters) > 1 else parameter_filters[0]
+
+    collector = DB.FilteredElementCollector(revit.doc)
+    if category is not None:
+        collector = collector.OfCategory(category)
+
+    return collector.WhereElementIsNotElementType().WherePasses(host_filter)
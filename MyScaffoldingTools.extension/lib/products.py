@@ -93,6 +93,17 @@ def sort_elements(elements, double_bracing = None, roof_system = None, anchor =
 
     return sorted(elements, key=get_sort_key)
 
+def collect_generic_models():
+    """Collects all placed generic model instances. Scaffolding families are modeled as generic models.
+
+    Returns:
+        Autodesk.Revit.DB.FilteredElementCollector: Collector of the placed generic model instances.
+    """
+
+    return DB.FilteredElementCollector(revit.doc)\
+            .OfCategory(DB.BuiltInCategory.OST_GenericModel)\
+            .WhereElementIsNotElementType()
+
 def find_scaffolding_components(double_bracing = None, roof_system = None, anchor = None):
     """Finds all scaffolding families in a Revit project which contains Product number (which are typically sub families).
     In addition to these, finds a main families (ie. functional families which controls the sub families) which may not
@@ -108,9 +119,7 @@ def find_scaffolding_components(double_bracing = None, roof_system = None, ancho
         list(Autodesk.Revit.DB, str): Sorted list of tuples where 1st item is Element class and 2nd item is product number.
     """
 
-    collector = DB.FilteredElementCollector(revit.doc)\
-                .OfCategory(DB.BuiltInCategory.OST_GenericModel)\
-                .WhereElementIsNotElementType()
+    collector = collect_generic_models()
     
     scaffolding_families = []
 
@@ -139,22 +148,65 @@ def find_scaffolding_components(double_bracing = None, roof_system = None, ancho
     
     return sort_elements(scaffolding_families, double_bracing, roof_system, anchor)
 
+def get_type_product_number(element_type):
+    """Finds type parameter named as Product number from the family type.
+
+    Args:
+        element_type: Autodesk.Revit.DB.FamilySymbol class.
+
+    Returns:
+        str: Product number as string. None if the type does not contain product number parameter.
+    """
+
+    type_param = element_type.LookupParameter("Product number")
+    if type_param and type_param.StorageType == DB.StorageType.String:
+        return type_param.AsString()
+
+    return None
+
+def collect_instances_of_type(element_type):
+    """Collects placed generic model instances of a certain family type.
+
+    Args:
+        element_type: Autodesk.Revit.DB.FamilySymbol class.
+
+    Returns:
+        Autodesk.Revit.DB.FilteredElementCollector: Collector of the placed instances.
+    """
+
+    return collect_generic_models().WherePasses(DB.FamilyInstanceFilter(revit.doc, element_type.Id))
+
 def find_families_with_unique_product_numbers():
     """Finds all unique elements in a Revit project based on distinct product numbers.
+    Scans family types instead of placed instances. When product number is a type parameter,
+    only the first placed instance of the type is fetched. Instances are iterated only for
+    the types where product number is an instance parameter.
 
     Returns:
         list: List of Autodesk.Revit.DB.Element objects with unique product numbers.
     """
 
-    collector = DB.FilteredElementCollector(revit.doc)\
-                .OfCategory(DB.BuiltInCategory.OST_GenericModel)\
-                .WhereElementIsNotElementType()
+    type_collector = DB.FilteredElementCollector(revit.doc)\
+                .OfClass(DB.FamilySymbol)\
+                .OfCategory(DB.BuiltInCategory.OST_GenericModel)
 
     unique_elements = {}
 
-    for element in collector:
-        product_number = get_product_number(element)
-        if product_number and product_number not in unique_elements:
+    for element_type in type_collector:
+        product_number = get_type_product_number(element_type)
+
+        if product_number is None:
+            for element in collect_instances_of_type(element_type):
+                instance_product_number = get_product_number(element)
+                if instance_product_number and instance_product_number not in unique_elements:
+                    unique_elements[instance_product_number] = element
+            continue
+
+        if not product_number or product_number in unique_elements:
+            continue
+
+        element = collect_instances_of_type(element_type).FirstElement()
+        if element:
             unique_elements[product_number] = element
 
-    return list(unique_elements.values())
\ No newline at end of file
+    return list(unique_elements.values())
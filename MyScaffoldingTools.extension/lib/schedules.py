@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+try:
+    from pyrevit import revit, DB, script
+except ImportError: # Headless use outside of Revit
+    revit = DB = script = None
+
+SCHEDULE_CACHE_ENVVAR = "SCAFFOLDING_SCHEDULE_CACHE"
+
+def get_document_version_key():
+    """Creates a key which identifies the current version of the Revit document.
+    Document version changes every time the document is saved.
+
+    Returns:
+        tuple: Document path, version GUID and number of saves.
+    """
+
+    version = DB.Document.GetDocumentVersion(revit.doc)
+    return revit.doc.PathName, str(version.VersionGUID), version.NumberOfSaves
+
+def get_schedule_cache():
+    """Returns schedule cache of the current document version. Cache is kept for the pyRevit session.
+    Unsaved documents and documents with unsaved changes get an empty cache, since their version
+    does not identify the content.
+
+    Returns:
+        dict: Cache with schedule name index and already read schedule tables.
+    """
+
+    if not revit.doc.PathName or revit.doc.IsModified:
+        return {"index": None, "tables": {}}
+
+    version_key = get_document_version_key()
+    cache = script.get_envvar(SCHEDULE_CACHE_ENVVAR)
+    if not cache or cache["version"] != version_key:
+        cache = {"version": version_key, "index": None, "tables": {}}
+        script.set_envvar(SCHEDULE_CACHE_ENVVAR, cache)
+
+    return cache
+
+def get_schedule_index(cache):
+    """Indexes schedules of the document by their names.
+
+    Args:
+        cache (dict): Schedule cache of the current document version.
+
+    Returns:
+        dict: Dictionary where key is schedule name and value is schedule element id.
+    """
+
+    if cache["index"] is None:
+        schedules = DB.FilteredElementCollector(revit.doc).OfClass(DB.ViewSchedule)
+        cache["index"] = {schedule.Name: schedule.Id for schedule in schedules}
+
+    return cache["index"]
+
+def read_schedule_body(schedule):
+    """Reads body section of the schedule into a row-major table. First row contains the column headers.
+
+    Args:
+        schedule: Autodesk.Revit.DB.ViewSchedule class.
+
+    Returns:
+        list: List of rows where each row is tuple of cell texts.
+    """
+
+    section_data = schedule.GetTableData().GetSectionData(DB.SectionType.Body)
+    num_of_cols = section_data.NumberOfColumns
+    body = DB.SectionType.Body
+
+    return [
+        tuple(schedule.GetCellText(body, row_index, col_index) for col_index in range(num_of_cols))
+        for row_index in range(section_data.NumberOfRows)
+    ]
+
+def get_schedule_table(schedule_name):
+    """Finds schedule by its name and returns its body as a row-major table. Table is read only once
+    per document version.
+
+    Args:
+        schedule_name (str): Name of the schedule.
+
+    Returns:
+        list: List of rows where each row is tuple of cell texts. None if schedule is not found.
+    """
+
+    cache = get_schedule_cache()
+    if schedule_name not in cache["tables"]:
+        schedule_id = get_schedule_index(cache).get(schedule_name)
+        if schedule_id is None:
+            return None
+        cache["tables"][schedule_name] = read_schedule_body(revit.doc.GetElement(schedule_id))
+
+    return cache["tables"][schedule_name]
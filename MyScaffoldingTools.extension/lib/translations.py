@@ -95,5 +95,60 @@ TRANSLATIONS = {
         "FIN": "Ankkurointiin käytettävät juoksut",
         "ENG": "O-ledgers needed for anchoring",
         "SWE": "Horisontalstag som behövs för förankring"
+    },
+    "Tarpaulin cutting": {
+        "FIN": "Peitteiden leikkauslista",
+        "ENG": "Tarpaulin cutting list",
+        "SWE": "Skärlista för presenningar"
+    },
+    "Changes": {
+        "FIN": "Muutokset",
+        "ENG": "Changes",
+        "SWE": "Ändringar"
+    },
+    "Status": {
+        "FIN": "Tila",
+        "ENG": "Status",
+        "SWE": "Status"
+    },
+    "Added": {
+        "FIN": "Lisätty",
+        "ENG": "Added",
+        "SWE": "Tillagd"
+    },
+    "Removed": {
+        "FIN": "Poistettu",
+        "ENG": "Removed",
+        "SWE": "Borttagen"
+    },
+    "Changed": {
+        "FIN": "Muuttunut",
+        "ENG": "Changed",
+        "SWE": "Ändrad"
+    },
+    "Product name": {
+        "FIN": "Tuotenimi",
+        "ENG": "Product name",
+        "SWE": "Produktnamn"
+    },
+    "Previous count": {
+        "FIN": "Edellinen määrä",
+        "ENG": "Previous count",
+        "SWE": "Tidigare antal"
+    },
+    "Count change": {
+        "FIN": "Määrän muutos",
+        "ENG": "Count change",
+        "SWE": "Ändring i antal"
+    },
+    "Weight change": {
+        "FIN": "Painon muutos kg",
+        "ENG": "Weight change kg",
+        "SWE": "Viktändring kg"
+    },
+    "Price change": {
+        "FIN": "Hinnan muutos €",
+        "ENG": "Price change €",
+        "SWE": "Prisändring €"
     }
 }